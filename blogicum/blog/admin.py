@@ -1,8 +1,27 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
+from .exports import iter_posts_csv
 from .models import Location, Category, Post, Comment
 
 admin.site.register(Location)
 admin.site.register(Category)
-admin.site.register(Post)
 admin.site.register(Comment)
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'pub_date', 'is_published')
+    list_filter = ('is_published', 'category')
+    list_select_related = ('author', 'category')
+    # Без общего COUNT(*) по всей таблице при фильтрации.
+    show_full_result_count = False
+    actions = ('export_csv',)
+
+    @admin.action(description='Выгрузить в CSV')
+    def export_csv(self, request, queryset):
+        response = StreamingHttpResponse(
+            iter_posts_csv(queryset), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="posts.csv"'
+        return response
@@ -0,0 +1,230 @@
+"""JSON API только для чтения: публикации, категории и комментарии.
+
+Списки листаются курсором (?cursor= из поля next ответа) по ?limit=
+записей и отдаются потоком: записи читаются через .iterator()
+и сериализуются по одной, так что ответ на 1000 записей не собирается
+в памяти целиком. ?fields= выбирает поля ответа, и из базы читаются
+только нужные для них столбцы (.only()) и связанные таблицы.
+ETag и Last-Modified считаются так же, как для HTML-страниц
+(blog.mixins.ConditionalGetMixin).
+"""
+import json
+from itertools import chain, islice
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from blog.cache import feed_validators, post_validators
+from blog.mixins import ConditionalGetMixin
+from blog.models import Category, Comment
+from blog.paginators import CursorPaginator, InvalidCursor
+from blog.querysets import (
+    detail_query,
+    is_published_query,
+    last_comment_subquery,
+    published_filter,
+)
+
+
+class BadRequest(Exception):
+    pass
+
+
+def related(name, field, published=False):
+    """Поле связанного объекта или None, если объекта нет
+    или он снят с публикации.
+    """
+    def get(obj):
+        value = getattr(obj, name)
+        if value is None or published and not value.is_published:
+            return None
+        return getattr(value, field)
+    return get
+
+
+# Поле ответа → (столбцы для .only(), функция получения значения).
+POST_FIELDS = {
+    'id': (('id',), attrgetter('pk')),
+    'title': (('title',), attrgetter('title')),
+    'excerpt': (('excerpt',), attrgetter('excerpt')),
+    'text': (('text',), attrgetter('text')),
+    'pub_date': (('pub_date',), attrgetter('pub_date')),
+    'author': (('author__username',), related('author', 'username')),
+    'category': (('category__slug',), related('category', 'slug')),
+    'location': (
+        ('location__name', 'location__is_published'),
+        related('location', 'name', published=True),
+    ),
+    'comment_count': (('comment_count',), attrgetter('comment_count')),
+    'image': (('image',), lambda post: post.image.url if post.image else None),
+    'url': (('id',), lambda post: post.get_absolute_url()),
+}
+POST_LIST_FIELDS = tuple(name for name in POST_FIELDS if name != 'text')
+COMMENT_FIELDS = {
+    'id': (('id',), attrgetter('pk')),
+    'text': (('text',), attrgetter('text')),
+    'created_at': (('created_at',), attrgetter('created_at')),
+    'author': (('author__username',), related('author', 'username')),
+}
+
+
+def dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def parse_fields(request, fields, default):
+    value = request.GET.get('fields')
+    if value is None:
+        return default
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in fields]
+    if unknown or not names:
+        raise BadRequest(
+            f'Неизвестные поля: {", ".join(unknown)}. '
+            f'Доступны: {", ".join(fields)}.')
+    return tuple(dict.fromkeys(names))
+
+
+def parse_limit(request):
+    value = request.GET.get('limit')
+    if value is None:
+        return settings.API_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= settings.API_MAX_PAGE_SIZE:
+        raise BadRequest(
+            f'limit должен быть от 1 до {settings.API_MAX_PAGE_SIZE}.')
+    return limit
+
+
+def sparse(queryset, fields, names, *required):
+    """Ограничивает queryset столбцами, нужными для полей names."""
+    paths = {*required}
+    for name in names:
+        paths.update(fields[name][0])
+    relations = {path.split('__')[0] for path in paths if '__' in path}
+    return queryset.select_related(None).select_related(*relations).only(
+        *paths, *relations)
+
+
+def serialize(obj, fields, names):
+    return {name: fields[name][1](obj) for name in names}
+
+
+def iter_page(objects, paginator, fields, names):
+    """Страница списка в JSON по одной записи.
+
+    objects — записи после курсора, на одну больше размера страницы:
+    лишняя запись означает, что есть следующая страница.
+    """
+    yield '{"results": ['
+    last = next_cursor = None
+    for number, obj in enumerate(objects):
+        if number == paginator.per_page:
+            next_cursor = paginator.encode_cursor(last)
+            break
+        yield (', ' if number else '') + dumps(serialize(obj, fields, names))
+        last = obj
+    yield f'], "next": {dumps(next_cursor)}}}'
+
+
+def published_post(pk, fields=POST_FIELDS, names=()):
+    """Опубликованная публикация с аннотациями для post_validators."""
+    queryset = detail_query().filter(published_filter()).annotate(
+        last_comment_at=last_comment_subquery())
+    return get_object_or_404(sparse(
+        queryset, fields, names, 'pub_date', 'author', 'category', 'location'
+    ), pk=pk)
+
+
+class ApiView(ConditionalGetMixin, View):
+    http_method_names = ('get', 'head', 'options')
+    fields = POST_FIELDS
+    default_fields = POST_LIST_FIELDS
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            self.names = parse_fields(
+                request, self.fields, self.default_fields)
+            return super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({'error': 'Не найдено.'}, status=404)
+        except (BadRequest, InvalidCursor) as error:
+            return JsonResponse({'error': str(error)}, status=400)
+
+    def stream(self, queryset, ordering):
+        paginator = CursorPaginator(
+            queryset, parse_limit(self.request), ordering)
+        objects, reverse = paginator.seek(self.request.GET.get('cursor'))
+        if reverse:
+            raise InvalidCursor('Неверный курсор страницы.')
+        objects = objects[:paginator.per_page + 1].iterator(
+            chunk_size=settings.EXPORT_CHUNK_SIZE)
+        # Запрос выполняется при чтении первой записи. Читаем её до ответа:
+        # ошибка запроса должна стать ответом с ошибкой, а не оборвать
+        # JSON после уже отправленного статуса 200.
+        first = list(islice(objects, 1))
+        return StreamingHttpResponse(
+            iter_page(
+                chain(first, objects), paginator, self.fields, self.names),
+            content_type='application/json')
+
+
+class PostListView(ApiView):
+    def get_queryset(self):
+        return is_published_query()
+
+    def get_validators(self):
+        return feed_validators(self.get_queryset())
+
+    def get(self, request, *args, **kwargs):
+        return self.stream(
+            sparse(self.get_queryset(), self.fields, self.names, 'pub_date'),
+            ('-pub_date', '-id'))
+
+
+class CategoryPostListView(PostListView):
+    def get_queryset(self):
+        return is_published_query().filter(
+            category__slug=self.kwargs['category'])
+
+    def get(self, request, *args, **kwargs):
+        get_object_or_404(
+            Category, slug=self.kwargs['category'], is_published=True)
+        return super().get(request, *args, **kwargs)
+
+
+class PostDetailView(ApiView):
+    default_fields = tuple(POST_FIELDS)
+
+    def get_validators(self):
+        self.object = published_post(
+            self.kwargs['pk'], self.fields, self.names)
+        return post_validators(self.object)
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            serialize(self.object, self.fields, self.names),
+            json_dumps_params={'ensure_ascii': False},
+            encoder=DjangoJSONEncoder)
+
+
+class CommentListView(ApiView):
+    fields = COMMENT_FIELDS
+    default_fields = tuple(COMMENT_FIELDS)
+
+    def get_validators(self):
+        return post_validators(published_post(self.kwargs['pk']))
+
+    def get(self, request, *args, **kwargs):
+        return self.stream(
+            sparse(
+                Comment.objects.filter(post_id=self.kwargs['pk']),
+                self.fields, self.names, 'created_at'),
+            ('created_at', 'id'))
@@ -0,0 +1,158 @@
+import math
+from datetime import datetime
+from hashlib import md5
+from uuid import UUID, uuid1
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.translation import get_language
+
+from blog.models import Post
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+FEED_GENERATION_KEY = 'blog:feed_generation'
+# Начало отсчёта времени uuid1 (15.10.1582) в интервалах по 100 нс
+# до начала эпохи Unix.
+UUID_EPOCH = 0x01b21dd213814000
+
+
+def new_stamp():
+    """Новая версия: uuid1 уникален и хранит время своего создания."""
+    return uuid1().hex
+
+
+def stamp_time(stamp):
+    """Время создания версии или None, если версия его не хранит."""
+    value = UUID(hex=stamp)
+    if value.version != 1:
+        return None
+    return datetime.fromtimestamp(
+        (value.time - UUID_EPOCH) / 10 ** 7, tz=timezone.utc)
+
+
+def version_key(kind, pk):
+    return f'blog:version:{kind}:{pk}'
+
+
+def bump_version(kind, pk):
+    cache.set(version_key(kind, pk), new_stamp(), None)
+
+
+def get_versions(*stamps):
+    """Возвращает версии объектов по парам (вид, pk).
+
+    Если версии нет в кеше, она создаётся заново: выпавшая из кеша версия
+    не должна совпасть со старой и вернуть устаревший фрагмент.
+    """
+    keys = [version_key(kind, pk) for kind, pk in stamps]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_stamp(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def post_versions(post):
+    """Версии публикации и связанных с ней автора, категории и места."""
+    return get_versions(
+        ('post', post.pk),
+        ('user', post.author_id),
+        ('category', post.category_id),
+        ('location', post.location_id),
+    )
+
+
+def post_card_key(post):
+    versions = post_versions(post)
+    stamp = md5(':'.join(versions).encode()).hexdigest()
+    return f'blog:post_card:{post.pk}:{get_language()}:{stamp}'
+
+
+def render_post_card(post):
+    key = post_card_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(POST_CARD_TEMPLATE, {'post': post})
+        cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return html
+
+
+def feed_generation():
+    generation = cache.get(FEED_GENERATION_KEY)
+    if generation is None:
+        cache.add(FEED_GENERATION_KEY, new_stamp(), None)
+        generation = cache.get(FEED_GENERATION_KEY)
+    return generation
+
+
+def purge_feed_cache():
+    cache.set(FEED_GENERATION_KEY, new_stamp(), None)
+
+
+def seconds_until_next_publication():
+    """Сколько секунд осталось до ближайшей отложенной публикации."""
+    now = timezone.now()
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=now
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if next_pub_date is None:
+        return None
+    return max(1, math.ceil((next_pub_date - now).total_seconds()))
+
+
+def feed_cache_timeout(timeout):
+    """Ограничивает время жизни кеша ленты ближайшей публикацией."""
+    until_publication = seconds_until_next_publication()
+    if until_publication is not None:
+        timeout = min(timeout, until_publication)
+    return timeout
+
+
+def latest(*moments):
+    """Самый поздний из моментов времени, пропуская None."""
+    return max(filter(None, moments), default=None)
+
+
+def post_validators(post):
+    """Версия страницы публикации и время её последнего изменения.
+
+    post должна быть получена с аннотациями is_visible и last_comment_at.
+    Версии связанных объектов меняются при каждом их сохранении,
+    а время создания версии служит временем изменения.
+    """
+    versions = post_versions(post)
+    version = ':'.join((*versions, str(post.is_visible)))
+    return version, latest(
+        post.pub_date, post.last_comment_at, *map(stamp_time, versions))
+
+
+def feed_validators(queryset):
+    """Версия ленты и время её последнего изменения.
+
+    Поколение кеша лент меняется при изменении публикаций, комментариев,
+    категорий, мест и пользователей, а дата самой новой публикации —
+    когда наступает время отложенной. Запрос берёт одну строку
+    по индексу дат публикации. Для пустой ленты возвращает (None, None).
+    """
+    newest = queryset.order_by('-pub_date').values_list(
+        'pub_date', flat=True).first()
+    if newest is None:
+        return None, None
+    generation = feed_generation()
+    return (
+        f'{generation}:{newest.isoformat()}',
+        latest(newest, stamp_time(generation)),
+    )
+
+
+def feed_page_key(request):
+    path = md5(request.get_full_path().encode()).hexdigest()
+    return f'blog:page:{feed_generation()}:{get_language()}:{path}'
+
+
+def feed_count_key(feed):
+    return f'blog:feed_count:{feed_generation()}:{feed}'
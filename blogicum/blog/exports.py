@@ -0,0 +1,31 @@
+import csv
+
+from django.conf import settings
+
+POST_EXPORT_FIELDS = (
+    'id', 'title', 'pub_date', 'is_published', 'author__username',
+    'category__slug', 'location__name', 'comment_count', 'image',
+)
+
+
+class Echo:
+    """Объект с методом write, который возвращает строку,
+    а не пишет её: csv.writer формирует строки по одной.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_posts_csv(queryset):
+    """Строки CSV с публикациями из queryset.
+
+    Записи читаются через .iterator(): в PostgreSQL это серверный
+    курсор, и в памяти одновременно находится не больше
+    EXPORT_CHUNK_SIZE строк.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(POST_EXPORT_FIELDS)
+    rows = queryset.order_by('pk').values_list(*POST_EXPORT_FIELDS)
+    for row in rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield writer.writerow(row)
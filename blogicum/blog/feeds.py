@@ -0,0 +1,173 @@
+"""RSS и Atom для общей ленты, категорий и авторов.
+
+ETag и Last-Modified вычисляются одним агрегирующим запросом по дате
+последней публикации и последнего комментария. Они и готовая лента
+хранятся в кеше до изменения публикаций, категорий или комментариев
+(blog.cache.purge_feed_cache), поэтому повторный условный запрос
+получает 304 без запросов к базе и без рендеринга.
+"""
+from hashlib import md5
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Max
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from blog.cache import feed_cache_timeout, feed_generation
+from blog.models import Category, User
+from blog.querysets import is_published_query, list_query
+
+
+class PostFeed(Feed):
+    """Лента публикаций с условными GET-запросами и кешем."""
+
+    def __call__(self, request, *args, **kwargs):
+        view = condition(
+            etag_func=self.etag, last_modified_func=self.last_modified,
+        )(self.render)
+        return view(request, *args, **kwargs)
+
+    def post_filter(self, **kwargs):
+        """Условия отбора публикаций по параметрам из URL."""
+        return {}
+
+    def cache_key(self, kind, **kwargs):
+        params = md5(repr(sorted(kwargs.items())).encode()).hexdigest()
+        return (
+            f'blog:syndication:{kind}:{feed_generation()}:'
+            f'{type(self).__name__}:{params}')
+
+    def validators(self, **kwargs):
+        key = self.cache_key('validators', **kwargs)
+        validators = cache.get(key)
+        if validators is None:
+            newest = is_published_query().filter(
+                **self.post_filter(**kwargs)
+            ).aggregate(
+                post=Max('pub_date'), comment=Max('comments__created_at'))
+            last_modified = max(filter(None, newest.values()), default=None)
+            etag = None
+            if last_modified is not None:
+                etag = md5(f'{key}:{last_modified}'.encode()).hexdigest()
+            validators = (etag, last_modified)
+            cache.set(key, validators, feed_cache_timeout(
+                settings.FEED_PAGE_CACHE_TIMEOUT))
+        return validators
+
+    def etag(self, request, *args, **kwargs):
+        return self.validators(**kwargs)[0]
+
+    def last_modified(self, request, *args, **kwargs):
+        return self.validators(**kwargs)[1]
+
+    def render(self, request, *args, **kwargs):
+        key = self.cache_key('response', **kwargs)
+        response = cache.get(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            # Last-Modified ставит condition по тем же данным, что и ETag:
+            # Feed учитывает только даты публикаций.
+            response.headers.pop('Last-Modified', None)
+            cache.set(key, response, feed_cache_timeout(
+                settings.FEED_PAGE_CACHE_TIMEOUT))
+        return response
+
+    def items(self, obj):
+        return list_query().filter(
+            **self.post_filter(**self.object_kwargs(obj))
+        )[:settings.SYNDICATION_ITEMS]
+
+    def object_kwargs(self, obj):
+        return {}
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('blog:profile', args=(item.author.username,))
+
+    def item_categories(self, item):
+        return (item.category.title,) if item.category else ()
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class LatestPostsFeed(PostFeed):
+    def title(self):
+        return 'Блогикум — новые публикации'
+
+    def description(self, obj=None):
+        return 'Последние публикации всех авторов.'
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class CategoryFeed(PostFeed):
+    def get_object(self, request, category):
+        return get_object_or_404(Category, slug=category, is_published=True)
+
+    def post_filter(self, category):
+        return {'category__slug': category}
+
+    def object_kwargs(self, obj):
+        return {'category': obj.slug}
+
+    def title(self, obj):
+        return f'Блогикум — {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+
+class AuthorFeed(PostFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def post_filter(self, username):
+        return {'author__username': username}
+
+    def object_kwargs(self, obj):
+        return {'username': obj.username}
+
+    def title(self, obj):
+        return f'Блогикум — публикации {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.username,))
+
+
+class LatestPostsAtomFeed(AtomFeedMixin, LatestPostsFeed):
+    pass
+
+
+class CategoryAtomFeed(AtomFeedMixin, CategoryFeed):
+    pass
+
+
+class AuthorAtomFeed(AtomFeedMixin, AuthorFeed):
+    pass
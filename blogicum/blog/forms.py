@@ -1,12 +1,77 @@
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, UnidentifiedImageError
 
 from .models import Comment, Post, User
 
 
+class PostImageField(forms.ImageField):
+    """ImageField, который проверяет размер файла и число пикселей
+    по заголовку изображения до того, как Pillow его декодирует.
+    """
+    default_error_messages = {
+        'too_large': 'Размер файла не должен превышать %(limit)s.',
+        'too_many_pixels': (
+            'Изображение слишком большое: %(width)s×%(height)s пикселей.'
+        ),
+    }
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        if data.size > settings.POST_IMAGE_MAX_SIZE:
+            raise ValidationError(
+                self.error_messages['too_large'], code='too_large',
+                params={'limit': filesizeformat(settings.POST_IMAGE_MAX_SIZE)})
+        if hasattr(data, 'temporary_file_path'):
+            source = data.temporary_file_path()
+        else:
+            source = data
+        try:
+            # Image.open читает только заголовок: размеры известны
+            # без распаковки пикселей.
+            with Image.open(source) as image:
+                width, height = image.size
+        except Image.DecompressionBombError:
+            raise ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image')
+        except (OSError, UnidentifiedImageError):
+            return super().to_python(data)
+        finally:
+            if hasattr(data, 'seek'):
+                data.seek(0)
+        if width * height > settings.POST_IMAGE_MAX_PIXELS:
+            raise ValidationError(
+                self.error_messages['too_many_pixels'],
+                code='too_many_pixels',
+                params={'width': width, 'height': height})
+        return super().to_python(data)
+
+
 class PostForm(forms.ModelForm):
+    def __init__(self, *args, rejected_uploads=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rejected_uploads = rejected_uploads
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for field_name in self.rejected_uploads:
+            if field_name in self.fields:
+                self.add_error(field_name, ValidationError(
+                    PostImageField.default_error_messages['too_large'],
+                    code='too_large',
+                    params={'limit': filesizeformat(
+                        settings.POST_IMAGE_MAX_SIZE)}))
+        return cleaned_data
+
     class Meta:
         model = Post
         exclude = ('author',)
+        field_classes = {
+            'image': PostImageField,
+        }
         widgets = {
             'pub_date': forms.DateTimeInput(attrs={'type': 'datetime-local'},)
         }
@@ -0,0 +1,165 @@
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from blog.storage import ContentAddressedStorage
+
+logger = logging.getLogger(__name__)
+
+RENDITION_DIR = 'renditions'
+# Ширина карточки — 40rem, поэтому вариант для «ретины» вдвое шире.
+RENDITION_WIDTHS = {
+    'card': 640,
+    'detail': 960,
+    'retina': 1280,
+}
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {
+        'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def rendition_name(source, rendition, image_format):
+    directory, filename = posixpath.split(source)
+    stem = posixpath.splitext(filename)[0]
+    extension = RENDITION_FORMATS[image_format][1]
+    return posixpath.join(
+        directory, RENDITION_DIR, f'{stem}_{rendition}.{extension}')
+
+
+def _encode(image, image_format):
+    pil_format, _, options = RENDITION_FORMATS[image_format]
+    if pil_format == 'JPEG' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, 'white')
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background.paste(image, mask=image.getchannel('A'))
+        else:
+            background.paste(image.convert('RGB'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    buffer = BytesIO()
+    # Метаданные (в том числе EXIF с координатами) в варианты не пишутся.
+    image.save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def create_renditions(image_file, overwrite=False):
+    """Сохраняет уменьшенные копии изображения в WebP и JPEG.
+
+    Возвращает словарь для Post.renditions: имя исходного файла
+    и имена файлов каждого варианта по форматам. С overwrite
+    существующие копии пересоздаются и заменяются на месте.
+    """
+    storage = image_file.storage
+    renditions = {'source': image_file.name}
+    try:
+        with storage.open(image_file.name, 'rb') as source:
+            original = Image.open(source)
+            original = ImageOps.exif_transpose(original)
+            original.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning(
+            'Не удалось обработать изображение %s', image_file.name,
+            exc_info=True)
+        return renditions
+    by_width = {}
+    for rendition, width in RENDITION_WIDTHS.items():
+        width = min(width, original.width)
+        # Изображение не увеличивается, поэтому у узкого оригинала
+        # несколько вариантов совпадают и хранятся одним файлом.
+        if width in by_width:
+            renditions[rendition] = by_width[width]
+            continue
+        files = {'width': width}
+        resized = None
+        for image_format in RENDITION_FORMATS:
+            name = rendition_name(image_file.name, rendition, image_format)
+            # Имя копии выводится из хеша оригинала, поэтому существующий
+            # файл уже содержит нужную копию той же загрузки.
+            if storage.exists(name) and not overwrite:
+                files[image_format] = name
+                continue
+            if resized is None:
+                height = round(original.height * width / original.width) or 1
+                resized = original.resize(
+                    (width, height), Image.Resampling.LANCZOS)
+            # Копией пользуются и другие публикации с тем же оригиналом,
+            # поэтому она заменяется, а не удаляется и создаётся заново.
+            save = storage.replace if overwrite else storage.save
+            files[image_format] = save(name, _encode(resized, image_format))
+        renditions[rendition] = by_width[width] = files
+    return renditions
+
+
+def strip_metadata(image_file):
+    """Удаляет EXIF из оригинала, сохраняя поворот из метаданных.
+
+    Возвращает новое имя файла или None, если оригинал не изменился.
+    """
+    storage = image_file.storage
+    try:
+        with storage.open(image_file.name, 'rb') as source:
+            original = Image.open(source)
+            if not original.getexif() or getattr(original, 'n_frames', 1) > 1:
+                return None
+            pil_format = original.format
+            icc_profile = original.info.get('icc_profile')
+            original = ImageOps.exif_transpose(original)
+            original.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning(
+            'Не удалось обработать изображение %s', image_file.name,
+            exc_info=True)
+        return None
+    options = {'icc_profile': icc_profile} if icc_profile else {}
+    if pil_format == 'JPEG':
+        options.update(quality=90, optimize=True)
+    buffer = BytesIO()
+    original.save(buffer, pil_format, **options)
+    # Оригинал может принадлежать и другим публикациям, поэтому очищенная
+    # копия сохраняется новым файлом, а старый удаляет collect_image.
+    directory = posixpath.dirname(image_file.name)
+    if ContentAddressedStorage.is_content_name(image_file.name):
+        directory = posixpath.dirname(directory)
+    extension = posixpath.splitext(image_file.name)[1]
+    return storage.save(
+        posixpath.join(directory, f'image{extension}'),
+        ContentFile(buffer.getvalue()))
+
+
+def rendition_names(source, renditions=None):
+    """Имена всех файлов-копий оригинала source."""
+    names = {
+        rendition_name(source, rendition, image_format)
+        for rendition in RENDITION_WIDTHS
+        for image_format in RENDITION_FORMATS
+    }
+    if renditions and renditions.get('source') == source:
+        # Копии из словаря учитываются, только если названы по этому
+        # оригиналу: при устаревшем source словарь может указывать
+        # на общие копии другого оригинала.
+        directory, filename = posixpath.split(source)
+        prefix = posixpath.join(
+            directory, RENDITION_DIR, posixpath.splitext(filename)[0] + '_')
+        for rendition in RENDITION_WIDTHS:
+            for image_format in RENDITION_FORMATS:
+                name = renditions.get(rendition, {}).get(image_format)
+                if name and name.startswith(prefix):
+                    names.add(name)
+    return names
+
+
+def srcset(storage, renditions, image_format):
+    candidates = {}
+    for rendition in RENDITION_WIDTHS:
+        files = renditions.get(rendition)
+        if files and image_format in files:
+            candidates[files['width']] = storage.url(files[image_format])
+    return ', '.join(
+        f'{url} {width}w' for width, url in sorted(candidates.items()))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.tasks import process_post_image
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии даже для уже обработанных изображений.')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only('image', 'renditions')
+        built = 0
+        for post in posts.iterator(chunk_size=500):
+            source = post.renditions.get('source')
+            if source == post.image.name and not options['force']:
+                continue
+            # Оригинал и копии общие у публикаций с одинаковым
+            # изображением: задача очищает EXIF и удаляет старые файлы
+            # только если на них больше никто не ссылается.
+            process_post_image(post.pk, force=options['force'])
+            built += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {built}'))
@@ -0,0 +1,56 @@
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import RENDITION_FORMATS, RENDITION_WIDTHS
+from blog.models import Post
+
+
+def walk(storage, directory):
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for name in directories:
+        yield from walk(storage, posixpath.join(directory, name))
+
+
+class Command(BaseCommand):
+    help = ('Удаляет файлы изображений, на которые не ссылается '
+            'ни одна публикация.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать файлы, которые будут удалены.')
+
+    def handle(self, *args, **options):
+        field = Post._meta.get_field('image')
+        storage = field.storage
+        if not storage.exists(field.upload_to):
+            return
+        referenced = set()
+        posts = Post.objects.exclude(image='').values_list(
+            'image', 'renditions')
+        for image, renditions in posts.iterator(chunk_size=2000):
+            referenced.add(image)
+            referenced.update(
+                renditions.get(rendition, {}).get(image_format)
+                for rendition in RENDITION_WIDTHS
+                for image_format in RENDITION_FORMATS
+            )
+        grace = timezone.now() - timedelta(
+            seconds=settings.POST_IMAGE_GC_GRACE)
+        deleted = 0
+        for name in walk(storage, field.upload_to):
+            if name in referenced or storage.get_modified_time(name) > grace:
+                continue
+            deleted += 1
+            if options['dry_run']:
+                self.stdout.write(name)
+            else:
+                storage.delete(name)
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено файлов: {deleted}'))
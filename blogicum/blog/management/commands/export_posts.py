@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.exports import iter_posts_csv
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Выгружает публикации в CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию stdout.')
+        parser.add_argument(
+            '--published', action='store_true',
+            help='Выгрузить только опубликованные записи.')
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.all()
+        if options['published']:
+            queryset = queryset.filter(is_published=True)
+        if not options['output']:
+            for line in iter_posts_csv(queryset):
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', newline='',
+                  encoding='utf-8') as output:
+            output.writelines(iter_posts_csv(queryset))
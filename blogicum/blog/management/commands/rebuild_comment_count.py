@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from blog.tasks import rebuild_comment_count
+from core.queue import enqueue
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count по таблице комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Поставить пересчёт в очередь фоновых задач.')
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            enqueue('blog.rebuild_comment_count')
+            self.stdout.write(
+                self.style.SUCCESS('Пересчёт поставлен в очередь'))
+            return
+        updated = rebuild_comment_count()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}'))
@@ -0,0 +1,30 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит заново поисковый индекс публикаций '
+        '(SEARCH_BACKEND = "index").')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Число процессов, которые индексируют публикации.')
+        parser.add_argument(
+            '--chunk-size', type=int,
+            default=settings.SEARCH_INDEX_CHUNK_SIZE,
+            help='Диапазон id публикаций для одного задания.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        documents = rebuild(
+            max(options['processes'], 1), max(options['chunk_size'], 1))
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано публикаций: {documents} '
+            f'за {time.monotonic() - started:.1f} с'))
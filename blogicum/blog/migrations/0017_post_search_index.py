@@ -0,0 +1,33 @@
+from django.db import migrations
+
+INDEX = 'blog_post_search_idx'
+# Выражение должно совпадать с blog.search.postgresql.VECTOR,
+# иначе планировщик не использует индекс.
+VECTOR = (
+    "to_tsvector('russian'::regconfig, "
+    "COALESCE(title, '') || ' ' || COALESCE(text, ''))"
+)
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX} ON blog_post USING GIN ({VECTOR})')
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,8 +1,25 @@
+from functools import cached_property
+from hashlib import md5
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.http import Http404
 from django.shortcuts import redirect
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.utils.translation import get_language
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition
 
+from blog.cache import feed_cache_timeout, feed_page_key
 from blog.models import Post
+from blog.paginators import (
+    CachedCountPaginator,
+    CursorPaginator,
+    InvalidCursor,
+)
+from blog.uploads import streaming_upload_handlers
 
 
 class PostMixinView(UserPassesTestMixin, View):
@@ -19,3 +36,139 @@ class PostMixinView(UserPassesTestMixin, View):
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', pk=self.post_id)
+
+
+class CursorPaginationMixin:
+    """Включает keyset-пагинацию списка по ?cursor=,
+    если задана настройка BLOG_CURSOR_PAGINATION.
+    """
+    cursor_kwarg = 'cursor'
+    cursor_ordering = ('-pub_date', '-id')
+
+    def get_cursor_pagination(self):
+        return getattr(settings, 'BLOG_CURSOR_PAGINATION', False)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.get_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(error)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class CachedCountPaginationMixin:
+    """Постраничная лента, число записей которой хранится в кеше."""
+    paginator_class = CachedCountPaginator
+
+    def get_feed_key(self):
+        raise NotImplementedError
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, count_key=self.get_feed_key(), **kwargs)
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified на повторные GET-запросы,
+    если страница не изменилась.
+
+    Наследники определяют get_validators(): версию страницы и время
+    её изменения, или (None, None), если страницу надо отрисовать.
+    Исключение из get_validators(), например Http404, обрабатывается
+    как обычно. Страница зависит от пользователя и CSRF-токена в формах,
+    поэтому они входят в ETag. Last-Modified отдаётся только анонимным:
+    по одной дате нельзя отличить страницу другого пользователя.
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    @cached_property
+    def validators(self):
+        return self.get_validators()
+
+    def etag(self, request, *args, **kwargs):
+        version, _ = self.validators
+        if version is None:
+            return None
+        viewer = csrf = ''
+        if request.user.is_authenticated:
+            viewer = request.user.pk
+            csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+        return md5(
+            f'{version}:{get_language()}:{viewer}:{csrf}'.encode()
+        ).hexdigest()
+
+    def last_modified(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return None
+        return self.validators[1]
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        view = condition(
+            etag_func=self.etag, last_modified_func=self.last_modified,
+        )(self._dispatch)
+        return view(request, *args, **kwargs)
+
+    def _dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        # Страница из кеша хранит ETag версии, с которой её отрисовали,
+        # а condition не заменяет уже заданные заголовки.
+        for header in ('ETag', 'Last-Modified'):
+            response.headers.pop(header, None)
+        return response
+
+
+class AnonymousPageCacheMixin:
+    """Кеширует страницу целиком для анонимных пользователей.
+
+    Время жизни не больше, чем до ближайшей отложенной публикации,
+    а изменения публикаций, категорий и комментариев сбрасывают кеш.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = feed_page_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            timeout = feed_cache_timeout(settings.FEED_PAGE_CACHE_TIMEOUT)
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(
+                    lambda rendered: cache.set(key, rendered, timeout))
+            else:
+                cache.set(key, response, timeout)
+        return response
+
+
+class StreamingUploadMixin:
+    """Принимает файлы потоково во временные файлы с ограничением
+    размера и сохранением прогресса загрузки.
+
+    Обработчики загрузки можно заменить только до первого обращения
+    к request.POST, а CsrfViewMiddleware читает его раньше view,
+    поэтому CSRF проверяется уже после замены обработчиков.
+    """
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers = streaming_upload_handlers(request)
+        return self._dispatch(request, *args, **kwargs)
+
+    @method_decorator(csrf_protect)
+    def _dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['rejected_uploads'] = getattr(
+            self.request, 'rejected_uploads', ())
+        return kwargs
@@ -1,10 +1,16 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.text import Truncator
 
+from blog.storage import ContentAddressedStorage
 from core.models import PublishedDateModel
 
 User = get_user_model()
 
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 512
+
 
 class Location(PublishedDateModel):
     name = models.CharField(max_length=256, verbose_name='Название места')
@@ -37,6 +43,12 @@ class Category(PublishedDateModel):
 class Post(PublishedDateModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.CharField(
+        max_length=EXCERPT_MAX_LENGTH,
+        editable=False,
+        blank=True,
+        verbose_name='Начало текста'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем — '
@@ -45,8 +57,15 @@ class Post(PublishedDateModel):
     image = models.ImageField(
         verbose_name='Изображение',
         upload_to='post_images',
+        storage=ContentAddressedStorage(),
         blank=True
     )
+    renditions = models.JSONField(
+        default=dict,
+        editable=False,
+        blank=True,
+        verbose_name='Уменьшенные копии изображения'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -69,15 +88,52 @@ class Post(PublishedDateModel):
         null=True,
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return reverse('blog:post_detail', args=(self.pk,))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        # Обращение к отложенному text загрузило бы его отдельным запросом,
+        # хотя текст не меняется.
+        if ('text' not in self.get_deferred_fields()
+                and (update_fields is None or 'text' in update_fields)):
+            self.excerpt = Truncator(
+                Truncator(self.text).words(EXCERPT_WORDS, truncate=' …')
+            ).chars(EXCERPT_MAX_LENGTH)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     text = models.TextField(verbose_name='Текст комментария')
@@ -101,6 +157,12 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return f'Комментарий пользователя {self.author}'
@@ -0,0 +1,194 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from blog.cache import feed_cache_timeout, feed_count_key
+
+# Значения, которые помещаются в целочисленный столбец любой базы:
+# INTEGER в SQLite и BIGINT в PostgreSQL — 64-битные со знаком.
+INTEGER_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class FeedPage(Page):
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который хранит число записей ленты в кеше.
+
+    COUNT(*) считается без сортировки и select_related, а сбрасывается
+    вместе с кешем лент при изменении публикаций.
+    """
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+    def page(self, number):
+        # Срез страницы не зависит от числа записей, поэтому устаревшее
+        # значение в кеше влияет только на ссылки пагинатора.
+        if self.orphans:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self)
+
+    def _count_objects(self):
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list)
+        return self.object_list.order_by().select_related(None).count()
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self._count_objects()
+        key = feed_count_key(self.count_key)
+        count = cache.get(key)
+        if count is None:
+            count = self._count_objects()
+            cache.set(key, count, feed_cache_timeout(
+                settings.FEED_COUNT_CACHE_TIMEOUT))
+        return count
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация: страница ищется по значениям полей сортировки
+    последней показанной записи, а не по OFFSET, поэтому любая страница
+    стоит столько же, сколько первая.
+    """
+    is_cursor = True
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def encode_cursor(self, obj, reverse=False):
+        opts = self.object_list.model._meta
+        values = [
+            opts.get_field(name).value_to_string(obj)
+            if name != 'pk' else str(obj.pk)
+            for name in self.fields
+        ]
+        payload = json.dumps({'v': values, 'r': reverse})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        opts = self.object_list.model._meta
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload['v']
+            if len(values) != len(self.fields):
+                raise ValueError
+            values = [
+                self._clean_value(
+                    opts.get_field(name if name != 'pk' else opts.pk.name),
+                    value)
+                for name, value in zip(self.fields, values)
+            ]
+            return values, bool(payload.get('r'))
+        except (binascii.Error, ValueError, KeyError, TypeError,
+                ValidationError):
+            raise InvalidCursor('Неверный курсор страницы.')
+
+    @staticmethod
+    def _clean_value(field, value):
+        # to_python принимает любое целое, а запрос с числом вне
+        # диапазона столбца падает с OverflowError.
+        value = field.to_python(value)
+        field.run_validators(value)
+        if isinstance(value, int) and value not in INTEGER_RANGE:
+            raise ValueError
+        return value
+
+    def _seek_filter(self, values, reverse):
+        condition = Q()
+        for position, name in enumerate(self.ordering):
+            descending = name.startswith('-')
+            lookup = 'lt' if descending != reverse else 'gt'
+            field = self.fields[position]
+            step = Q(**{f'{field}__{lookup}': values[position]})
+            for previous, value in zip(self.fields[:position], values):
+                step &= Q(**{previous: value})
+            condition |= step
+        return condition
+
+    def seek(self, cursor=None):
+        """Записи после курсора в порядке обхода, без ограничения
+        размером страницы, и признак обхода в обратную сторону.
+        """
+        reverse = False
+        query_set = self.object_list
+        if cursor:
+            values, reverse = self.decode_cursor(cursor)
+            query_set = query_set.filter(self._seek_filter(values, reverse))
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                name[1:] if name.startswith('-') else f'-{name}'
+                for name in ordering
+            )
+        return query_set.order_by(*ordering), reverse
+
+    def page(self, cursor=None):
+        query_set, reverse = self.seek(cursor)
+        object_list = list(query_set[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+        next_cursor = previous_cursor = None
+        if object_list and has_next:
+            next_cursor = self.encode_cursor(object_list[-1])
+        if object_list and has_previous:
+            previous_cursor = self.encode_cursor(object_list[0], reverse=True)
+        return CursorPage(object_list, self, next_cursor, previous_cursor)
@@ -1,9 +1,17 @@
-from blog.models import Post
-from django.db.models import Count
+from blog.models import Comment, Post
+from django.db.models import (
+    BooleanField,
+    Count,
+    ExpressionWrapper,
+    OuterRef,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
-def all_query(annotate_comment_count=True):
+def all_query():
     query_set = (
         Post.objects.select_related(
             'category',
@@ -12,15 +20,81 @@ def all_query(annotate_comment_count=True):
         )
         .order_by('-pub_date')
     )
-    if annotate_comment_count:
-        query_set = query_set.annotate(comment_count=Count('comments'))
     return query_set
 
 
-def is_published_query(annotate_comment_count=True):
-    query_set = all_query(annotate_comment_count).filter(
+def published_filter():
+    return Q(
         pub_date__lte=timezone.now(),
         is_published=True,
         category__is_published=True,
+    )
+
+
+def is_published_query():
+    query_set = all_query().filter(
+        published_filter()
     ).order_by('-pub_date')
     return query_set
+
+
+def detail_query():
+    """Все публикации с флагом is_visible: видна ли публикация всем."""
+    return all_query().annotate(is_visible=ExpressionWrapper(
+        published_filter(), output_field=BooleanField()))
+
+
+def visible_query(user):
+    """Публикации, которые может открыть пользователь."""
+    condition = published_filter()
+    if user.is_authenticated:
+        condition |= Q(author=user)
+    return Post.objects.filter(condition)
+
+
+def comment_count_subquery():
+    comments = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(comments), 0)
+
+
+def last_comment_subquery():
+    """Время последнего комментария по индексу (post, created_at)."""
+    return Subquery(
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by('-created_at')
+        .values('created_at')[:1]
+    )
+
+
+POST_CARD_FIELDS = (
+    'title',
+    'excerpt',
+    'pub_date',
+    'image',
+    'renditions',
+    'is_published',
+    'comment_count',
+    'author',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'category',
+    'category__slug',
+    'category__title',
+    'category__is_published',
+    'location',
+    'location__name',
+    'location__is_published',
+)
+
+
+def list_query(published=True):
+    """Публикации для лент: только поля, которые выводит post_card.html."""
+    query_set = is_published_query() if published else all_query()
+    return query_set.only(*POST_CARD_FIELDS)
@@ -0,0 +1,45 @@
+"""Поиск по публикациям.
+
+Реализация выбирается настройкой SEARCH_BACKEND: 'sqlite' (FTS5),
+'postgresql' (tsvector и GIN-индекс), 'index' (собственный
+инвертированный индекс на диске), 'simple' (icontains без индекса)
+или 'auto' — по типу базы данных.
+"""
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connection
+
+from blog.search.query import parse_query, snippet
+
+BACKENDS = ('sqlite', 'postgresql', 'simple')
+
+
+def get_backend():
+    name = settings.SEARCH_BACKEND
+    if name == 'auto':
+        name = connection.vendor if connection.vendor in BACKENDS else 'simple'
+        if name == 'sqlite':
+            from blog.search.sqlite import fts5_available
+            if not fts5_available(connection):
+                name = 'simple'
+    return import_module(f'blog.search.{name}')
+
+
+def search(queryset, query):
+    """Публикации из queryset, подходящие под запрос, по убыванию
+    релевантности. Видимость задаёт переданный queryset.
+    """
+    groups = parse_query(query)
+    if not groups:
+        return queryset.none()
+    return get_backend().search(queryset, groups)
+
+
+def add_snippets(posts, query):
+    groups = parse_query(query)
+    # Бэкенд может сравнивать слова по-своему, например по основам.
+    matches = getattr(get_backend(), 'matches', None)
+    for post in posts:
+        post.snippet = snippet(post.text, groups, matches)
+    return posts
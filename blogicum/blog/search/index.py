@@ -0,0 +1,504 @@
+"""Поиск по собственному инвертированному индексу на диске.
+
+Для баз без FTS5 и PostgreSQL (SEARCH_BACKEND = 'index'). Индекс
+хранится в SEARCH_INDEX_DIR поколениями: каталог поколения содержит
+сегмент (blog.search.segment) и журнал log.jsonl с изменениями
+публикаций после построения сегмента, а файл CURRENT указывает
+текущее поколение.
+
+Изменения дописывает в журнал задача blog.update_search_index.
+Процессы, которые ищут, дочитывают журнал перед каждым запросом,
+поэтому изменения видны сразу. Когда журнал разрастается, сегмент
+и журнал сливаются в новое поколение; manage.py rebuild_search_index
+строит индекс заново по базе данных.
+"""
+import fcntl
+import gc
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import cached_property
+from operator import itemgetter
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, IntegerField, Max, Value, When
+
+from blog.models import Post
+from blog.search.query import tokenize
+from blog.search.segment import (
+    K1,
+    Segment,
+    concatenate,
+    encode,
+    write_segment,
+)
+from blog.search.stemmer import stem
+
+CURRENT = 'CURRENT'
+LOG = 'log.jsonl'
+LOCK = 'lock'
+# Слово заголовка весит как несколько слов текста.
+TITLE_WEIGHT = 3
+
+
+def analyze(title, text):
+    """Длина документа и словарь основа → [частота, позиции].
+
+    Между заголовком и текстом пропускается позиция, чтобы фраза
+    не находилась на их стыке.
+    """
+    title_words = tokenize(title or '')
+    words = title_words + [''] + tokenize(text or '')
+    positions = defaultdict(list)
+    for position, term in enumerate(map(stem, words)):
+        positions[term].append(position)
+    del positions['']
+    boundary = len(title_words)
+    terms = {
+        term: [
+            len(term_positions)
+            + (TITLE_WEIGHT - 1) * bisect_left(term_positions, boundary),
+            term_positions,
+        ]
+        for term, term_positions in positions.items()
+    }
+    return len(words) - 1, terms
+
+
+def document_record(pk, title, text):
+    length, terms = analyze(title, text)
+    return {'id': pk, 'length': length, 'terms': terms}
+
+
+class Overlay:
+    """Изменения из журнала поверх сегмента.
+
+    documents: id → (длина, термы) или None для удалённых публикаций;
+    terms: основа → {id: (частота, позиции)}.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.terms = {}
+
+    def apply(self, record):
+        doc = record['id']
+        previous = self.documents.get(doc)
+        if previous is not None:
+            for term in previous[1]:
+                postings = self.terms[term]
+                del postings[doc]
+                if not postings:
+                    del self.terms[term]
+        if 'terms' not in record:
+            self.documents[doc] = None
+            return
+        self.documents[doc] = (record['length'], record['terms'])
+        for term, (tf, positions) in record['terms'].items():
+            self.terms.setdefault(term, {})[doc] = (tf, positions)
+
+
+class TermPostings:
+    """Вхождения терма с учётом журнала."""
+
+    def __init__(self, postings, extra, masked):
+        self.postings = postings
+        self.extra = extra
+        self.masked = masked
+
+    @cached_property
+    def docs(self):
+        docs = set(self.extra)
+        if self.postings is not None:
+            if self.masked:
+                docs.update(
+                    doc for doc in self.postings.docs
+                    if doc not in self.masked)
+            else:
+                docs.update(self.postings.docs)
+        return docs
+
+    def frequencies(self, candidates):
+        """Пары (id, частота) для документов из candidates."""
+        extra = self.extra
+        if self.postings is not None:
+            pairs = zip(self.postings.docs, self.postings.tfs)
+            if extra:
+                pairs = (pair for pair in pairs if pair[0] not in extra)
+            for doc, tf in pairs:
+                if doc in candidates:
+                    yield doc, tf
+        for doc, (tf, _) in extra.items():
+            if doc in candidates:
+                yield doc, tf
+
+    def positions(self, doc):
+        if doc in self.extra:
+            return self.extra[doc][1]
+        return self.postings.positions(doc)
+
+
+def has_phrase(doc, postings):
+    """Идут ли термы postings в документе подряд."""
+    starts = set(postings[0].positions(doc))
+    for offset, term_postings in enumerate(postings[1:], 1):
+        starts.intersection_update(
+            position - offset for position in term_postings.positions(doc))
+        if not starts:
+            return False
+    return True
+
+
+class SearchIndex:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.generation = None
+        self.segment = None
+        self.overlay = Overlay()
+        self.log_offset = 0
+        self._lock = threading.Lock()
+
+    def generation_path(self, generation):
+        return self.path / f'{generation:08d}'
+
+    def current_generation(self):
+        try:
+            return int((self.path / CURRENT).read_text())
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def lock(self):
+        """Блокировка записи, общая для всех процессов."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / LOCK, 'a') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    # Чтение.
+
+    def refresh(self):
+        generation = self.current_generation()
+        if generation != self.generation:
+            if self.segment is not None:
+                self.segment.close()
+            self.generation, self.segment = generation, None
+            self.overlay, self.log_offset = Overlay(), 0
+            if generation is not None:
+                self.segment = Segment(self.generation_path(generation))
+        if self.segment is not None:
+            self._read_log()
+
+    def _read_log(self):
+        log = self.generation_path(self.generation) / LOG
+        try:
+            with open(log, 'rb') as file:
+                file.seek(self.log_offset)
+                data = file.read()
+        except FileNotFoundError:
+            return
+        # Последняя строка может быть дописана не до конца.
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            self.overlay.apply(json.loads(line))
+        self.log_offset += end
+
+    def term_postings(self, term):
+        return TermPostings(
+            self.segment.postings(term), self.overlay.terms.get(term, {}),
+            self.overlay.documents)
+
+    def search(self, groups, limit):
+        """Id не более limit лучших документов по убыванию BM25."""
+        with self._lock:
+            self.refresh()
+            if self.segment is None:
+                return []
+            scores, *others = (
+                self._search_group(group, limit) for group in groups)
+            # Документ, подходящий под несколько групп ИЛИ, получает
+            # лучшую из оценок.
+            for group_scores in others:
+                for doc, score in group_scores.items():
+                    if score > scores.get(doc, 0):
+                        scores[doc] = score
+        return [
+            doc for doc, _ in
+            heapq.nlargest(limit, scores.items(), key=itemgetter(1))]
+
+    def _search_group(self, group, limit):
+        clauses = [[stem(word) for word in clause] for clause in group]
+        if len(clauses) == 1 and len(clauses[0]) == 1:
+            scores = self._search_term(clauses[0][0], limit)
+            if scores is not None:
+                return scores
+        postings = {
+            term: self.term_postings(term)
+            for clause in clauses for term in clause
+        }
+        # Пересечение начинается с самого редкого терма.
+        ordered = sorted(postings.values(), key=lambda item: len(item.docs))
+        candidates = set(ordered[0].docs)
+        for term_postings in ordered[1:]:
+            candidates.intersection_update(term_postings.docs)
+        for clause in clauses:
+            if len(clause) > 1 and candidates:
+                phrase = [postings[term] for term in clause]
+                candidates = {
+                    doc for doc in candidates if has_phrase(doc, phrase)}
+        if not candidates:
+            return {}
+        norms = {doc: self.norm(doc) for doc in candidates}
+        scores = dict.fromkeys(candidates, 0.0)
+        for term_postings in postings.values():
+            weight = self.weight(len(term_postings.docs))
+            for doc, tf in term_postings.frequencies(candidates):
+                scores[doc] += weight * tf / (tf + norms[doc])
+        return scores
+
+    def _search_term(self, term, limit):
+        """Оценки лучших документов для запроса из одного слова.
+
+        Ранжируются только сохранённые в сегменте лучшие документы
+        терма и документы из журнала: остальные вхождения терма
+        заведомо хуже. Возвращает None, если после изменений из
+        журнала лучших документов осталось меньше limit.
+        """
+        top = self.segment.top(term)
+        if top is None:
+            return None
+        changed = self.overlay.documents
+        extra = self.overlay.terms.get(term, {})
+        pairs = [
+            (doc, tf) for doc, tf in zip(*top) if doc not in changed]
+        if len(pairs) < limit:
+            return None
+        pairs.extend((doc, tf) for doc, (tf, _) in extra.items())
+        # Число документов терма нужно только для idf, поэтому
+        # изменения из журнала в нём не учитываются.
+        weight = self.weight(self.segment.lexicon[term][1])
+        return {
+            doc: weight * tf / (tf + self.norm(doc)) for doc, tf in pairs}
+
+    def weight(self, frequency):
+        """Множитель BM25 терма: (K1 + 1) * idf."""
+        documents = max(self.segment.documents, 1)
+        return (K1 + 1) * math.log(
+            1 + (documents - frequency + 0.5) / (frequency + 0.5))
+
+    def norm(self, doc):
+        """Слагаемое знаменателя BM25, зависящее от длины документа."""
+        document = self.overlay.documents.get(doc)
+        length = document[0] if document else self.segment.lengths[doc]
+        return self.segment.norm_base + self.segment.norm_scale * length
+
+    # Запись.
+
+    def update(self, post_ids):
+        """Записывает в журнал текущее состояние публикаций post_ids."""
+        with self.lock():
+            generation = self.current_generation()
+            if generation is None:
+                generation = self._publish(
+                    self._new_segment(iter(()), array('I')))
+            # Публикации читаются под блокировкой, поэтому в журнале
+            # более позднее состояние всегда записано позже.
+            rows = {
+                pk: (title, text) for pk, title, text in
+                Post.objects.filter(pk__in=post_ids)
+                .values_list('pk', 'title', 'text')
+            }
+            log = self.generation_path(generation) / LOG
+            with open(log, 'a', encoding='utf-8') as file:
+                for pk in post_ids:
+                    record = (
+                        document_record(pk, *rows[pk]) if pk in rows
+                        else {'id': pk})
+                    file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if log.stat().st_size > settings.SEARCH_INDEX_LOG_MAX_SIZE:
+                self._compact()
+
+    def _new_segment(self, terms, lengths):
+        path = Path(tempfile.mkdtemp(prefix='tmp-', dir=self.path))
+        path.rmdir()
+        return write_segment(
+            path, terms, lengths, settings.SEARCH_INDEX_MAX_RESULTS)
+
+    def _publish(self, path, log=b''):
+        """Делает сегмент path следующим поколением. Вызывается
+        под блокировкой записи.
+        """
+        generation = (self.current_generation() or 0) + 1
+        (path / LOG).write_bytes(log)
+        path.rename(self.generation_path(generation))
+        current = self.path / f'{CURRENT}.tmp'
+        current.write_text(str(generation))
+        os.replace(current, self.path / CURRENT)
+        # Предыдущее поколение остаётся для процессов, которые
+        # ещё не заметили смену.
+        for old in self.path.glob('0*'):
+            if int(old.name) < generation - 1:
+                shutil.rmtree(old, ignore_errors=True)
+        return generation
+
+    def _compact(self):
+        """Сливает сегмент и журнал текущего поколения в новое."""
+        with self._lock:
+            self.refresh()
+            segment, overlay = self.segment, self.overlay
+            lengths = array('I', segment.lengths)
+            for doc, document in overlay.documents.items():
+                if doc >= len(lengths):
+                    lengths.extend([0] * (doc + 1 - len(lengths)))
+                lengths[doc] = document[0] if document else 0
+            terms = sorted(set(segment.lexicon) | set(overlay.terms))
+            self._publish(self._new_segment(
+                self._merge_overlay(terms), lengths))
+
+    def _merge_overlay(self, terms):
+        segment, overlay = self.segment, self.overlay
+        for term in terms:
+            postings = segment.postings(term)
+            extra = overlay.terms.get(term, {})
+            if postings is not None and not extra and (
+                    overlay.documents.keys().isdisjoint(postings.docs)):
+                yield (term, *segment.raw(term))
+                continue
+            merged = [
+                (doc, tf, positions) for doc, tf, positions in postings or ()
+                if doc not in overlay.documents
+            ]
+            merged.extend(
+                (doc, tf, positions) for doc, (tf, positions) in extra.items())
+            if merged:
+                merged.sort()
+                yield (term, *encode(merged))
+
+
+_indexes = {}
+
+
+def get_index():
+    path = str(settings.SEARCH_INDEX_DIR)
+    if path not in _indexes:
+        _indexes[path] = SearchIndex(path)
+    return _indexes[path]
+
+
+def _build_part(arguments):
+    """Строит сегмент по публикациям с id из [low, high)."""
+    path, low, high = arguments
+    postings = {}
+    lengths = array('I', bytes((high - low) * array('I').itemsize))
+    rows = (
+        Post.objects.filter(pk__gte=low, pk__lt=high).order_by('pk')
+        .values_list('pk', 'title', 'text')
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+    # Списки вхождений не содержат циклов, а сборщик мусора, который
+    # раз за разом обходит миллионы новых объектов, вдвое замедляет
+    # построение.
+    collect = gc.isenabled()
+    gc.disable()
+    try:
+        for pk, title, text in rows:
+            length, terms = analyze(title, text)
+            lengths[pk - low] = length
+            for term, (tf, positions) in terms.items():
+                postings.setdefault(term, []).append((pk, tf, positions))
+        write_segment(path, (
+            (term, *encode(postings[term])) for term in sorted(postings)
+        ), lengths)
+    finally:
+        if collect:
+            gc.enable()
+    return path
+
+
+def _merge_parts(parts):
+    terms = sorted(set().union(*(part.lexicon for part in parts)))
+    for term in terms:
+        yield (term, *concatenate(
+            (part.postings(term).items, part.lexicon[term][1])
+            for part in parts if term in part.lexicon
+        ))
+
+
+def rebuild(processes=1, chunk_size=None):
+    """Строит индекс по всем публикациям, разбивая их по диапазонам id
+    между processes процессами. Возвращает число документов.
+
+    Изменения, записанные в журнал во время построения, переносятся
+    в журнал нового поколения.
+    """
+    index = get_index()
+    chunk_size = chunk_size or settings.SEARCH_INDEX_CHUNK_SIZE
+    with index.lock():
+        start_generation = index.current_generation()
+        start_offset = 0
+        if start_generation is not None:
+            start_offset = (
+                index.generation_path(start_generation) / LOG).stat().st_size
+    top = (Post.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+    with tempfile.TemporaryDirectory(dir=index.path) as directory:
+        chunks = [
+            (Path(directory) / f'part-{low}', low, min(low + chunk_size, top))
+            for low in range(0, top, chunk_size)
+        ]
+        if processes > 1:
+            # Дочерние процессы открывают собственные соединения с БД.
+            connections.close_all()
+            with multiprocessing.Pool(processes) as pool:
+                paths = pool.map(_build_part, chunks)
+        else:
+            paths = [_build_part(chunk) for chunk in chunks]
+        parts = [Segment(path) for path in paths]
+        lengths = array('I')
+        for part in parts:
+            lengths.extend(part.lengths)
+        path = index._new_segment(_merge_parts(parts), lengths)
+        for part in parts:
+            part.close()
+    with index.lock():
+        log = []
+        generation = index.current_generation()
+        for number in range(start_generation or 1, (generation or 0) + 1):
+            try:
+                with open(index.generation_path(number) / LOG, 'rb') as file:
+                    if number == start_generation:
+                        file.seek(start_offset)
+                    log.append(file.read())
+            except FileNotFoundError:
+                continue
+        index._publish(path, b''.join(log))
+    return len(lengths) - lengths.count(0)
+
+
+def search(queryset, groups):
+    ids = get_index().search(groups, settings.SEARCH_INDEX_MAX_RESULTS)
+    if not ids:
+        return queryset.none()
+    rank = Case(
+        *(When(pk=pk, then=Value(position))
+          for position, pk in enumerate(ids)),
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).annotate(rank=rank).order_by('rank')
+
+
+def matches(word, query_word):
+    return stem(word) == stem(query_word)
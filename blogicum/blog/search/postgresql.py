@@ -0,0 +1,34 @@
+"""Полнотекстовый поиск PostgreSQL с русской конфигурацией.
+
+Выражение VECTOR совпадает с выражением GIN-индекса
+blog_post_search_idx из миграции 0017, поэтому условие @@ использует
+индекс, а не вычисляет tsvector для каждой строки.
+"""
+VECTOR = (
+    "to_tsvector('russian'::regconfig, "
+    "COALESCE(blog_post.title, '') || ' ' || COALESCE(blog_post.text, ''))"
+)
+QUERY = "websearch_to_tsquery('russian'::regconfig, %s)"
+
+
+def tsquery(groups):
+    """Строка для websearch_to_tsquery: фразы в кавычках, группы
+    через or.
+    """
+    return ' or '.join(
+        ' '.join(
+            clause[0] if len(clause) == 1 else '"{}"'.format(' '.join(clause))
+            for clause in group
+        )
+        for group in groups
+    )
+
+
+def search(queryset, groups):
+    query = tsquery(groups)
+    return queryset.extra(
+        select={'rank': f'ts_rank_cd({VECTOR}, {QUERY})'},
+        select_params=[query],
+        where=[f'{VECTOR} @@ {QUERY}'],
+        params=[query],
+    ).order_by('-rank', '-pub_date')
@@ -0,0 +1,81 @@
+import re
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+WORD_RE = re.compile(r'\w+')
+CLAUSE_RE = re.compile(r'"([^"]*)"|(\S+)')
+OR_WORDS = {'OR', 'ИЛИ', '|'}
+SNIPPET_WORDS = 30
+SNIPPET_CONTEXT = 8
+
+
+def normalize(word):
+    return word.lower().replace('ё', 'е')
+
+
+def tokenize(text):
+    return WORD_RE.findall(normalize(text))
+
+
+def parse_query(query):
+    """Разбирает строку поиска.
+
+    Возвращает список групп, объединённых через ИЛИ; группа — список
+    условий, которые должны выполняться все. Условие — кортеж слов:
+    одно слово или фраза в кавычках.
+    Например, 'дом "старый сад" ИЛИ дача' даёт
+    [[('дом',), ('старый', 'сад')], [('дача',)]].
+    """
+    groups = [[]]
+    for phrase, word in CLAUSE_RE.findall(query):
+        if word in OR_WORDS:
+            groups.append([])
+            continue
+        if phrase:
+            words = tuple(tokenize(phrase))
+            if words:
+                groups[-1].append(words)
+        else:
+            groups[-1].extend((token,) for token in tokenize(word))
+    return [group for group in groups if group]
+
+
+def query_words(groups):
+    return {word for group in groups for clause in group for word in clause}
+
+
+def snippet(text, groups, matches=None):
+    """Фрагмент текста вокруг первого найденного слова с выделением
+    найденных слов тегом <mark>.
+
+    matches(word, query_word) сравнивает слово текста со словом
+    запроса; по умолчанию слово текста должно начинаться со слова
+    запроса, как при префиксном поиске.
+    """
+    if matches is None:
+        def matches(word, query_word):
+            return word.startswith(query_word)
+    terms = query_words(groups)
+    tokens = list(WORD_RE.finditer(text))
+    found = [
+        index for index, token in enumerate(tokens)
+        if any(matches(normalize(token.group()), term) for term in terms)
+    ]
+    if not found:
+        return Truncator(text).words(SNIPPET_WORDS, truncate=' …')
+    first = max(found[0] - SNIPPET_CONTEXT, 0)
+    last = min(first + SNIPPET_WORDS, len(tokens)) - 1
+    highlighted = set(found)
+    parts = ['… ' if first else '']
+    position = tokens[first].start()
+    for index in range(first, last + 1):
+        token = tokens[index]
+        parts.append(escape(text[position:token.start()]))
+        word = escape(token.group())
+        parts.append(f'<mark>{word}</mark>' if index in highlighted else word)
+        position = token.end()
+    if last < len(tokens) - 1:
+        parts.append(' …')
+    return mark_safe(''.join(parts))
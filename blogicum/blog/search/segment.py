@@ -0,0 +1,242 @@
+"""Сегмент инвертированного индекса на диске.
+
+Сегмент — каталог с файлами:
+postings.bin — списки вхождений всех термов подряд, массив uint32;
+top.bin — лучшие документы частых термов, массив uint32;
+lexicon.pickle — словарь терм → (смещение, число документов, число позиций)
+и словарь терм → (смещение, число документов) для top.bin;
+lengths.bin — длины документов, массив uint32 с индексом по id;
+meta.json — число документов и их суммарная длина.
+
+Список вхождений терма состоит из четырёх частей: id документов
+в виде разностей соседних значений, взвешенные частоты, число позиций
+в каждом документе и сами позиции, тоже разностями внутри документа.
+Разности небольшие, а array('I') хранит их без накладных расходов
+на объекты Python.
+
+Для термов, которые встречаются больше чем в top_size документах,
+в top.bin записываются top_size документов с наибольшим весом BM25
+терма и их частоты. Запрос из одного слова ранжирует только их,
+а не обходит весь список вхождений.
+"""
+import heapq
+import json
+import mmap
+import os
+import pickle
+from array import array
+from functools import cached_property
+from itertools import accumulate, chain
+from operator import add, sub, truediv
+from pathlib import Path
+
+POSTINGS = 'postings.bin'
+TOP = 'top.bin'
+LEXICON = 'lexicon.pickle'
+LENGTHS = 'lengths.bin'
+META = 'meta.json'
+ITEM_SIZE = array('I').itemsize
+# Параметры BM25.
+K1 = 1.2
+B = 0.75
+
+
+def deltas(values):
+    """Разности соседних значений, первое — от нуля."""
+    return map(sub, values, chain((0,), values))
+
+
+def norm_factors(total_length, documents):
+    """Коэффициенты знаменателя BM25: tf + base + scale * длина."""
+    average = total_length / max(documents, 1) or 1
+    return K1 * (1 - B), K1 * B / average
+
+
+def encode(postings):
+    """Кодирует список (id, частота, позиции) по возрастанию id.
+
+    Возвращает байты, число документов и число позиций.
+    """
+    docs = array('I', deltas([doc for doc, _, _ in postings]))
+    tfs = array('I', (tf for _, tf, _ in postings))
+    counts = array('I', (len(positions) for _, _, positions in postings))
+    positions = array('I')
+    for _, _, doc_positions in postings:
+        positions.extend(deltas(doc_positions))
+    data = (docs + tfs + counts + positions).tobytes()
+    return data, len(docs), len(positions)
+
+
+def concatenate(parts):
+    """Склеивает закодированные вхождения терма из сегментов,
+    id документов в которых идут по возрастанию.
+
+    parts — пары (массив, число документов).
+    """
+    docs, tfs, counts, positions = (array('I') for _ in range(4))
+    last = 0
+    for items, size in parts:
+        part = items[:size]
+        total = sum(part)
+        # Первое значение в сегменте хранится от нуля, а в общем
+        # списке — от последнего id предыдущего сегмента.
+        part[0] -= last
+        last = total
+        docs.extend(part)
+        tfs.extend(items[size:2 * size])
+        counts.extend(items[2 * size:3 * size])
+        positions.extend(items[3 * size:])
+    data = (docs + tfs + counts + positions).tobytes()
+    return data, len(docs), len(positions)
+
+
+class Postings:
+    """Декодированные вхождения одного терма.
+
+    Id документов раскодируются целиком, а позиции — только для
+    документов, которые проверяются на совпадение фразы.
+    """
+
+    def __init__(self, items, size):
+        self.items = items
+        self.size = size
+
+    @cached_property
+    def docs(self):
+        return list(accumulate(self.items[:self.size]))
+
+    @cached_property
+    def tfs(self):
+        return self.items[self.size:2 * self.size]
+
+    @cached_property
+    def index(self):
+        return {doc: number for number, doc in enumerate(self.docs)}
+
+    @cached_property
+    def offsets(self):
+        counts = self.items[2 * self.size:3 * self.size]
+        return list(accumulate(counts, initial=3 * self.size))
+
+    def positions(self, doc, number=None):
+        if number is None:
+            number = self.index[doc]
+        start, end = self.offsets[number], self.offsets[number + 1]
+        return list(accumulate(self.items[start:end]))
+
+    def __iter__(self):
+        for number, doc in enumerate(self.docs):
+            yield doc, self.items[self.size + number], self.positions(
+                doc, number)
+
+
+class Segment:
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / LEXICON, 'rb') as file:
+            self.lexicon = pickle.load(file)
+            self.top_lexicon = pickle.load(file)
+        with open(self.path / META) as file:
+            meta = json.load(file)
+        self.documents = meta['documents']
+        self.total_length = meta['total_length']
+        self.norm_base, self.norm_scale = norm_factors(
+            self.total_length, self.documents)
+        self.lengths = array('I')
+        with open(self.path / LENGTHS, 'rb') as file:
+            self.lengths.frombytes(file.read())
+        self.data = self._map(POSTINGS)
+        self.top_data = self._map(TOP)
+
+    def _map(self, name):
+        with open(self.path / name, 'rb') as file:
+            # Пустой файл нельзя отобразить в память.
+            if not os.fstat(file.fileno()).st_size:
+                return b''
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def raw(self, term):
+        """Закодированные вхождения терма, число документов и позиций."""
+        offset, size, positions = self.lexicon[term]
+        end = offset + 3 * size + positions
+        return self.data[offset * ITEM_SIZE:end * ITEM_SIZE], size, positions
+
+    def postings(self, term):
+        if term not in self.lexicon:
+            return None
+        data, size, _ = self.raw(term)
+        items = array('I')
+        items.frombytes(data)
+        return Postings(items, size)
+
+    def top(self, term):
+        """Лучшие документы терма и их частоты или None, если терм
+        встречается редко и лучшие документы не сохранялись.
+        """
+        if term not in self.top_lexicon:
+            return None
+        offset, size = self.top_lexicon[term]
+        items = array('I')
+        items.frombytes(
+            self.top_data[offset * ITEM_SIZE:(offset + 2 * size) * ITEM_SIZE])
+        return items[:size], items[size:]
+
+    def close(self):
+        for data in (self.data, self.top_data):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def best_documents(data, size, norms, top_size):
+    """top_size документов с наибольшим весом tf / (tf + norm)."""
+    items = array('I')
+    items.frombytes(data[:2 * size * ITEM_SIZE])
+    docs = list(accumulate(items[:size]))
+    tfs = items[size:]
+    weights = map(truediv, tfs, map(add, tfs, map(norms.__getitem__, docs)))
+    best = heapq.nlargest(top_size, zip(weights, docs, tfs))
+    return (
+        array('I', [doc for _, doc, _ in best])
+        + array('I', [tf for _, _, tf in best])
+    ).tobytes()
+
+
+def write_segment(path, terms, lengths, top_size=0):
+    """Записывает сегмент в новый каталог path.
+
+    terms — четвёрки (терм, байты, число документов, число позиций)
+    в порядке возрастания термов; lengths — array('I') длин документов.
+    """
+    path = Path(path)
+    path.mkdir(parents=True)
+    documents = len(lengths) - lengths.count(0)
+    total_length = sum(lengths)
+    base, scale = norm_factors(total_length, documents)
+    norms = None
+    lexicon, top_lexicon = {}, {}
+    offset = top_offset = 0
+    with open(path / POSTINGS, 'wb') as file, \
+            open(path / TOP, 'wb') as top_file:
+        for term, data, size, positions in terms:
+            file.write(data)
+            lexicon[term] = (offset, size, positions)
+            offset += len(data) // ITEM_SIZE
+            if not top_size or size <= top_size:
+                continue
+            if norms is None:
+                norms = array(
+                    'd', (base + scale * length for length in lengths))
+            top_file.write(best_documents(data, size, norms, top_size))
+            top_lexicon[term] = (top_offset, top_size)
+            top_offset += 2 * top_size
+    with open(path / LEXICON, 'wb') as file:
+        pickle.dump(lexicon, file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(top_lexicon, file, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(path / LENGTHS, 'wb') as file:
+        lengths.tofile(file)
+    with open(path / META, 'w') as file:
+        json.dump({
+            'documents': documents,
+            'total_length': total_length,
+        }, file)
+    return path
@@ -0,0 +1,16 @@
+"""Поиск без индекса через icontains: для баз без полнотекстового
+поиска и небольших объёмов данных.
+"""
+from django.db.models import Q
+
+
+def search(queryset, groups):
+    condition = Q()
+    for group in groups:
+        group_condition = Q()
+        for clause in group:
+            phrase = ' '.join(clause)
+            group_condition &= (
+                Q(title__icontains=phrase) | Q(text__icontains=phrase))
+        condition |= group_condition
+    return queryset.filter(condition)
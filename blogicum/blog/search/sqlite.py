@@ -0,0 +1,94 @@
+"""Полнотекстовый поиск SQLite FTS5.
+
+Таблица blog_post_fts хранит только индекс (external content):
+тексты берутся из blog_post, а триггеры обновляют индекс при каждом
+изменении публикации, в том числе через update() и bulk_create().
+"""
+from django.db import connections
+
+FTS_TABLE = 'blog_post_fts'
+TRIGGERS = {
+    f'{FTS_TABLE}_insert': f'''
+        CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON blog_post BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END''',
+    f'{FTS_TABLE}_delete': f'''
+        CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON blog_post BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+        END''',
+    f'{FTS_TABLE}_update': f'''
+        CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF title, text
+        ON blog_post BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+            VALUES ('delete', old.id, old.title, old.text);
+            INSERT INTO {FTS_TABLE}(rowid, title, text)
+            VALUES (new.id, new.title, new.text);
+        END''',
+}
+# Заголовок важнее текста при ранжировании bm25.
+TITLE_WEIGHT = 5.0
+
+
+def fts5_available(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def install(using='default', **kwargs):
+    """Создаёт таблицу FTS5 и триггеры, если их нет.
+
+    Вызывается после каждой миграции: при изменении полей SQLite
+    пересоздаёт таблицу blog_post, и её триггеры удаляются вместе
+    со старой таблицей. Тогда индекс строится заново.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not fts5_available(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'blog_post'")
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [
+            sql for name, sql in TRIGGERS.items() if name not in existing]
+        if not missing:
+            return
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "title, text, content='blog_post', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')")
+        for sql in missing:
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def quote(word):
+    return '"{}"'.format(word.replace('"', '""'))
+
+
+def match_expression(groups):
+    """Выражение MATCH: слова ищутся по префиксу, фразы — целиком."""
+    return ' OR '.join(
+        '({})'.format(' AND '.join(
+            f'{quote(clause[0])}*' if len(clause) == 1
+            else quote(' '.join(clause))
+            for clause in group
+        ))
+        for group in groups
+    )
+
+
+def search(queryset, groups):
+    return queryset.extra(
+        select={'rank': f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0)'},
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = blog_post.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match_expression(groups)],
+    ).order_by('rank', '-pub_date')
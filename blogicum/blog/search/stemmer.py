@@ -0,0 +1,78 @@
+"""Стеммер Портера (Snowball) для русского языка.
+
+Слова без русских гласных, например латиница и числа, возвращаются
+без изменений.
+"""
+import re
+from functools import lru_cache
+
+from blog.search.query import normalize
+
+VOWELS = 'аеиоуыэюя'
+RV_RE = re.compile(f'^.*?[{VOWELS}]')
+REGION_RE = re.compile(f'[{VOWELS}][^{VOWELS}]')
+
+# Окончания первой группы стоят после «а» или «я», которые не удаляются.
+# Поиск с якорем $ находит самое левое совпадение, то есть самое
+# длинное окончание, как требует алгоритм.
+PERFECTIVE_GERUND_RE = re.compile(
+    r'((?<=[ая])(в|вши|вшись)|ив|ивши|ившись|ыв|ывши|ывшись)$')
+REFLEXIVE_RE = re.compile(r'(ся|сь)$')
+ADJECTIVE = (
+    r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых'
+    r'|ую|юю|ая|яя|ою|ею)'
+)
+PARTICIPLE = r'((?<=[ая])(ем|нн|вш|ющ|щ)|ивш|ывш|ующ)'
+ADJECTIVAL_RE = re.compile(f'{PARTICIPLE}?{ADJECTIVE}$')
+VERB_RE = re.compile(
+    r'((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)'
+    r'|ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло'
+    r'|ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю)$')
+NOUN_RE = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием'
+    r'|ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$')
+DERIVATIONAL_RE = re.compile(r'ость?$')
+SUPERLATIVE_RE = re.compile(r'ейше?$')
+
+
+def _region(word, start=0):
+    match = REGION_RE.search(word, start)
+    return match.end() if match else len(word)
+
+
+def _cut(pattern, word):
+    match = pattern.search(word)
+    return (word[:match.start()], True) if match else (word, False)
+
+
+@lru_cache(maxsize=100_000)
+def stem(word):
+    word = normalize(word)
+    match = RV_RE.match(word)
+    if match is None:
+        return word
+    prefix, rv = word[:match.end()], word[match.end():]
+    # Шаг 1: деепричастие, иначе возвратная частица и затем
+    # прилагательное, глагол или существительное.
+    rv, found = _cut(PERFECTIVE_GERUND_RE, rv)
+    if not found:
+        rv = REFLEXIVE_RE.sub('', rv, 1)
+        for pattern in (ADJECTIVAL_RE, VERB_RE, NOUN_RE):
+            rv, found = _cut(pattern, rv)
+            if found:
+                break
+    # Шаг 2.
+    if rv.endswith('и'):
+        rv = rv[:-1]
+    # Шаг 3: словообразовательное окончание только в области R2.
+    r2 = _region(word, _region(word)) - len(prefix)
+    match = DERIVATIONAL_RE.search(rv)
+    if match and match.start() >= r2:
+        rv = rv[:match.start()]
+    # Шаг 4.
+    rv, found = _cut(SUPERLATIVE_RE, rv)
+    if rv.endswith('нн'):
+        rv = rv[:-1]
+    elif not found and rv.endswith('ь'):
+        rv = rv[:-1]
+    return prefix + rv
@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.cache import bump_version, purge_feed_cache
+from blog.models import Category, Comment, Location, Post, User
+from core.queue import enqueue
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    bump_version('post', instance.pk)
+    purge_feed_cache()
+
+
+@receiver(post_save, sender=Post)
+def update_image_renditions(sender, instance, raw=False, **kwargs):
+    source = instance.image.name or ''
+    if raw or instance.renditions.get('source', '') == source:
+        return
+    enqueue('blog.process_post_image', instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def collect_deleted_image(sender, instance, **kwargs):
+    if instance.image.name:
+        enqueue(
+            'blog.collect_image', instance.image.name, instance.renditions)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def update_search_index(sender, instance, raw=False, update_fields=None,
+                        **kwargs):
+    if raw or settings.SEARCH_BACKEND != 'index':
+        return
+    if update_fields is not None and not {'title', 'text'} & set(
+            update_fields):
+        return
+    enqueue('blog.update_search_index', instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    bump_version('post', instance.post_id)
+    purge_feed_cache()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    bump_version('category', instance.pk)
+    purge_feed_cache()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, instance, **kwargs):
+    bump_version('location', instance.pk)
+    purge_feed_cache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Вход пользователя сохраняет только last_login, страницы от него
+    # не меняются.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_version('user', instance.pk)
+    purge_feed_cache()
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import posixpath
+import re
+import uuid
+
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+
+HASH_NAME_RE = re.compile(r'^[0-9a-f]{64}')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файлы под именем из SHA-256 содержимого:
+    post_images/ab/<sha256>.jpg.
+
+    Одинаковые загрузки попадают в один файл и повторно не пишутся.
+    Файл может принадлежать нескольким публикациям, поэтому удалять
+    его можно только через blog.images.collect_image.
+    """
+
+    @staticmethod
+    def is_content_name(name):
+        return bool(HASH_NAME_RE.match(posixpath.basename(name)))
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = posixpath.split(name)
+        checksum = digest.hexdigest()
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(
+            directory, checksum[:2], f'{checksum}{extension}')
+
+    def get_available_name(self, name, max_length=None):
+        if self.is_content_name(name) and self.exists(name):
+            raise FileExistsError(name)
+        return super().get_available_name(name, max_length)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        if not self.is_content_name(name):
+            name = self.content_name(name, content)
+        try:
+            return super().save(name, content, max_length)
+        except FileExistsError:
+            # Файл с таким содержимым уже есть, в том числе если его
+            # только что записал параллельный запрос. Время изменения
+            # обновляется, чтобы сборщик не удалил файл, пока новая
+            # ссылка на него ещё не сохранена в базе.
+            os.utime(self.path(name))
+            return name
+
+    def replace(self, name, content):
+        """Перезаписывает файл с именем-хешем целиком: другие процессы
+        видят либо старое, либо новое содержимое, но не пропавший файл.
+        """
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        if not self.is_content_name(name):
+            return super()._save(name, content)
+        # Файл пишется под временным именем и переименовывается целиком,
+        # чтобы под именем-хешем никогда не оказался недописанный файл.
+        temporary = super()._save(posixpath.join(
+            posixpath.dirname(name), f'.{uuid.uuid4().hex}.tmp'), content)
+        os.replace(self.path(temporary), self.path(name))
+        return name
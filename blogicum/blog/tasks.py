@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from blog.cache import bump_version, purge_feed_cache
+from blog.images import create_renditions, rendition_names, strip_metadata
+from blog.models import Post
+from blog.querysets import comment_count_subquery
+from blog.search.index import get_index
+from core.queue import task
+
+
+def collect_image(name, renditions=None):
+    """Удаляет оригинал и его копии, если на оригинал не ссылается
+    ни одна публикация.
+
+    Недавно записанные или повторно загруженные файлы не трогаются:
+    ссылка на них может быть ещё не сохранена. Их позже удалит
+    команда collect_post_images.
+    """
+    storage = Post._meta.get_field('image').storage
+    if not name or Post.objects.filter(image=name).exists():
+        return False
+    grace = timezone.now() - timedelta(seconds=settings.POST_IMAGE_GC_GRACE)
+    if storage.exists(name) and storage.get_modified_time(name) > grace:
+        return False
+    for file_name in rendition_names(name, renditions) | {name}:
+        if storage.exists(file_name):
+            storage.delete(file_name)
+    return True
+
+
+@task('blog.process_post_image')
+def process_post_image(post_id, force=False):
+    """Очищает EXIF оригинала и создаёт уменьшенные копии.
+
+    С force копии пересоздаются, даже если уже построены для текущего
+    изображения.
+    """
+    post = Post.objects.filter(pk=post_id).only('image', 'renditions').first()
+    if post is None or (
+            not force
+            and post.renditions.get('source', '') == post.image.name):
+        return
+    source, previous = post.image.name, post.renditions
+    if source:
+        post.image.name = strip_metadata(post.image) or source
+        renditions = create_renditions(post.image, overwrite=force)
+    else:
+        renditions = {}
+    # Пока задача ждала в очереди, автор мог заменить изображение:
+    # тогда результат устарел и его записывает следующая задача.
+    updated = Post.objects.filter(pk=post_id, image=source).update(
+        image=post.image.name, renditions=renditions)
+    if updated:
+        bump_version('post', post_id)
+        purge_feed_cache()
+    for name in {previous.get('source'), source, post.image.name}:
+        collect_image(name, previous)
+
+
+@task('blog.collect_image')
+def collect_post_image(name, renditions=None):
+    collect_image(name, renditions)
+
+
+@task('blog.rebuild_comment_count')
+def rebuild_comment_count():
+    with transaction.atomic():
+        updated = Post.objects.update(comment_count=comment_count_subquery())
+    purge_feed_cache()
+    return updated
+
+
+@task('blog.update_search_index')
+def update_search_index(*post_ids):
+    get_index().update(post_ids)
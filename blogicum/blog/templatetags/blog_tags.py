@@ -0,0 +1,25 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cache import render_post_card
+from blog.images import srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    return mark_safe(render_post_card(post))
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, rendition='card'):
+    storage = post.image.storage
+    files = post.renditions.get(rendition)
+    return {
+        'original_url': post.image.url,
+        'src': storage.url(files['jpeg']) if files else post.image.url,
+        'webp_srcset': srcset(storage, post.renditions, 'webp'),
+        'jpeg_srcset': srcset(storage, post.renditions, 'jpeg'),
+        'lazy': rendition == 'card',
+    }
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    SkipFile,
+    TemporaryFileUploadHandler,
+)
+
+PROGRESS_ID = 'X-Progress-ID'
+# Прогресс пишется в кеш не на каждый фрагмент, а примерно раз в 256 КБ.
+PROGRESS_STEP = 256 * 1024
+
+
+def progress_key(request, progress_id):
+    return f'upload:progress:{request.user.pk}:{progress_id}'
+
+
+def get_progress_id(request):
+    return (request.GET.get(PROGRESS_ID)
+            or request.META.get('HTTP_X_PROGRESS_ID'))
+
+
+class UploadProgressHandler(FileUploadHandler):
+    """Сохраняет в кеш число полученных байтов запроса
+    с идентификатором X-Progress-ID.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        self.progress_id = get_progress_id(self.request)
+        self.received = self.reported = 0
+        self.content_length = content_length
+        self._report()
+
+    def _report(self, done=False):
+        if not self.progress_id:
+            return
+        cache.set(progress_key(self.request, self.progress_id), {
+            'received': self.content_length if done else self.received,
+            'size': self.content_length,
+            'done': done,
+        }, settings.UPLOAD_PROGRESS_TIMEOUT)
+        self.reported = self.received
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received - self.reported >= PROGRESS_STEP:
+            self._report()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+    def upload_complete(self):
+        self._report(done=True)
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """Пропускает файл, как только он превысит POST_IMAGE_MAX_SIZE.
+
+    Остаток файла не читается в память и не пишется на диск, а имя
+    поля попадает в request.rejected_uploads, чтобы форма показала
+    ошибку вместо того, чтобы молча оставить поле пустым.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > settings.POST_IMAGE_MAX_SIZE:
+            rejected = getattr(self.request, 'rejected_uploads', set())
+            rejected.add(self.field_name)
+            self.request.rejected_uploads = rejected
+            raise SkipFile
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def streaming_upload_handlers(request):
+    # Файл пишется во временный файл на диске независимо от размера,
+    # а FileSystemStorage потом перемещает его, а не копирует.
+    return [
+        UploadProgressHandler(request),
+        LimitedUploadHandler(request),
+        TemporaryFileUploadHandler(request),
+    ]
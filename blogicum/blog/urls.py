@@ -1,6 +1,6 @@
 from django.urls import include, path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'blog'
 
@@ -10,16 +10,38 @@ urlpatterns = [
         views.IndexView.as_view(),
         name='index'
     ),
+    path('feeds/rss/', feeds.LatestPostsFeed(), name='feed_rss'),
+    path('feeds/atom/', feeds.LatestPostsAtomFeed(), name='feed_atom'),
+    path('api/v1/', include([
+        path('posts/', api.PostListView.as_view(), name='api_posts'),
+        path('posts/<int:pk>/', api.PostDetailView.as_view(),
+             name='api_post'),
+        path('posts/<int:pk>/comments/', api.CommentListView.as_view(),
+             name='api_comments'),
+        path('categories/<slug:category>/posts/',
+             api.CategoryPostListView.as_view(), name='api_category_posts'),
+    ])),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
         name='create_post'
     ),
+    path(
+        'posts/upload-progress/',
+        views.upload_progress,
+        name='upload_progress'
+    ),
     path('posts/<int:pk>/', include([
         path('', views.PostDetailView.as_view(), name='post_detail'),
         path('edit/', views.PostUpdateView.as_view(), name='edit_post'),
         path('delete/', views.PostDeleteView.as_view(), name='delete_post'),
         path('comment/', views.add_comment, name='add_comment'),
+        path('comments/', views.comment_list, name='comments'),
         path('edit_comment/<int:comment_id>/', views.edit_comment,
              name='edit_comment'),
         path('delete_comment/<int:comment_id>', views.delete_comment,
@@ -30,6 +52,16 @@ urlpatterns = [
         views.UserPostsView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<username>/rss/',
+        feeds.AuthorFeed(),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<username>/atom/',
+        feeds.AuthorAtomFeed(),
+        name='profile_feed_atom'
+    ),
     path(
         'edit_profile/',
         views.UserEditView.as_view(),
@@ -40,4 +72,14 @@ urlpatterns = [
         views.CategoryPostsView.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category>/rss/',
+        feeds.CategoryFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category>/atom/',
+        feeds.CategoryAtomFeed(),
+        name='category_feed_atom'
+    ),
 ]
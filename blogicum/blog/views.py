@@ -1,13 +1,40 @@
+import hashlib
+
+from blog.cache import feed_validators, post_validators
 from blog.forms import CommentForm, PostForm, UserForm
 from blog.models import Category, Comment, Post
-from blog.querysets import all_query, is_published_query
-from blog.mixins import PostMixinView
+from blog.paginators import CursorPaginator, InvalidCursor
+from blog.querysets import (
+    POST_CARD_FIELDS,
+    all_query,
+    detail_query,
+    is_published_query,
+    last_comment_subquery,
+    list_query,
+    visible_query,
+)
+from blog.search import add_snippets, search
+from blog.mixins import (
+    AnonymousPageCacheMixin,
+    CachedCountPaginationMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    PostMixinView,
+    StreamingUploadMixin,
+)
+from blog.uploads import get_progress_id, progress_key
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
+from django.utils.http import urlencode
+from django.views.decorators.cache import never_cache
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -18,17 +45,28 @@ from django.views.generic import (
 from django.views.generic.detail import SingleObjectMixin
 
 OBJECTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 10
 USERNAME_KWARG = 'username'
 PK_KWARG = 'pk'
 CATEGORY_KWARG = 'category'
+SEARCH_QUERY_MAX_LENGTH = 200
 
 
-class IndexView(ListView):
+class IndexView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                CursorPaginationMixin, CachedCountPaginationMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
-    queryset = is_published_query()
     paginate_by = OBJECTS_PER_PAGE
 
+    def get_validators(self):
+        return feed_validators(is_published_query())
+
+    def get_feed_key(self):
+        return 'index'
+
+    def get_queryset(self):
+        return list_query()
+
 
 class UserEditView(LoginRequiredMixin, UpdateView):
     model = User
@@ -43,11 +81,11 @@ class UserEditView(LoginRequiredMixin, UpdateView):
         return reverse('blog:profile', kwargs={USERNAME_KWARG: username})
 
 
-class UserPostsView(SingleObjectMixin, ListView):
+class UserPostsView(ConditionalGetMixin, CursorPaginationMixin,
+                    CachedCountPaginationMixin, SingleObjectMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = OBJECTS_PER_PAGE
-    queryset = all_query()
     slug_url_kwarg = USERNAME_KWARG
     slug_field = USERNAME_KWARG
 
@@ -57,22 +95,34 @@ class UserPostsView(SingleObjectMixin, ListView):
         self.object = self.user
         return super().get(request, *args, **kwargs)
 
+    def get_validators(self):
+        username = self.kwargs[self.slug_url_kwarg]
+        # Автор видит и свои неопубликованные публикации.
+        own = self.request.user.get_username() == username
+        posts = all_query() if own else is_published_query()
+        return feed_validators(posts.filter(author__username=username))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.user
         return context
 
+    def get_feed_key(self):
+        scope = 'all' if self.user == self.request.user else 'published'
+        return f'author:{self.user.pk}:{scope}'
+
     def get_queryset(self):
-        if self.user != self.request.user:
-            return is_published_query().filter(author=self.user)
-        return super().get_queryset().filter(author=self.user)
+        return list_query(
+            published=self.user != self.request.user
+        ).filter(author=self.user)
 
 
-class CategoryPostsView(SingleObjectMixin, ListView):
+class CategoryPostsView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                        CursorPaginationMixin, CachedCountPaginationMixin,
+                        SingleObjectMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
     paginate_by = OBJECTS_PER_PAGE
-    queryset = is_published_query()
     slug_url_kwarg = CATEGORY_KWARG
 
     def get(self, request, *args, **kwargs):
@@ -81,16 +131,49 @@ class CategoryPostsView(SingleObjectMixin, ListView):
         self.object = self.category
         return super().get(request, *args, **kwargs)
 
+    def get_validators(self):
+        return feed_validators(is_published_query().filter(
+            category__slug=self.kwargs[self.slug_url_kwarg]))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context[CATEGORY_KWARG] = self.category
         return context
 
+    def get_feed_key(self):
+        return f'category:{self.category.pk}'
+
     def get_queryset(self):
-        return super().get_queryset().filter(category=self.category)
+        return list_query().filter(category=self.category)
+
+
+class SearchView(CachedCountPaginationMixin, ListView):
+    template_name = 'blog/search.html'
+    paginate_by = OBJECTS_PER_PAGE
+
+    def get(self, request, *args, **kwargs):
+        self.query = request.GET.get('q', '').strip()[
+            :SEARCH_QUERY_MAX_LENGTH]
+        return super().get(request, *args, **kwargs)
 
+    def get_feed_key(self):
+        digest = hashlib.md5(self.query.encode()).hexdigest()
+        return f'search:{digest}'
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+    def get_queryset(self):
+        return search(
+            is_published_query().only(*POST_CARD_FIELDS, 'text'), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        page.object_list = add_snippets(list(page.object_list), self.query)
+        context['query'] = self.query
+        context['page_query'] = urlencode({'q': self.query}) + '&'
+        return context
+
+
+class PostCreateView(StreamingUploadMixin, LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
@@ -107,7 +190,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return url
 
 
-class PostUpdateView(PostMixinView, UpdateView):
+class PostUpdateView(StreamingUploadMixin, PostMixinView, UpdateView):
     form_class = PostForm
 
     def get_success_url(self):
@@ -124,41 +207,94 @@ class PostDeleteView(PostMixinView, DeleteView):
         return context
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = PK_KWARG
 
     def get_queryset(self):
-        post = self.get_object(queryset=Post.objects.all())
-        queryset = (all_query(annotate_comment_count=False)
-                    if self.request.user == post.author
-                    else is_published_query(annotate_comment_count=False))
-        return queryset
+        return detail_query().annotate(last_comment_at=last_comment_subquery())
+
+    def get_validators(self):
+        # Публикация загружается один раз: и для ETag, и для страницы.
+        self.object = self.get_object()
+        return post_validators(self.object)
+
+    def get(self, request, *args, **kwargs):
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        user = self.request.user
+        is_author = user.is_authenticated and post.author_id == user.pk
+        if not (post.is_visible or is_author):
+            raise Http404
+        return post
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.all().select_related(
-            'author')
+        context['comments'] = comments_page(self.object.pk)
         return context
 
 
+def is_ajax(request):
+    return request.headers.get('x-requested-with') == 'XMLHttpRequest'
+
+
+def comments_page(post_id, cursor=None):
+    paginator = CursorPaginator(
+        Comment.objects.filter(post_id=post_id).select_related('author'),
+        COMMENTS_PER_PAGE,
+        ordering=('created_at', 'id'),
+    )
+    return paginator.page(cursor)
+
+
+def comment_list(request, pk):
+    if not visible_query(request.user).filter(pk=pk).exists():
+        raise Http404
+    try:
+        page = comments_page(pk, request.GET.get('cursor'))
+    except InvalidCursor as error:
+        raise Http404(error)
+    if is_ajax(request):
+        html = render_to_string(
+            'includes/comment_list.html', {'comments': page}, request)
+        return JsonResponse({'html': html, 'next': page.next_cursor})
+    return render(request, 'blog/comments.html', {
+        'post_id': pk,
+        'comments': page,
+    })
+
+
+@never_cache
+@login_required
+def upload_progress(request):
+    progress_id = get_progress_id(request)
+    if not progress_id:
+        raise Http404
+    return JsonResponse(cache.get(progress_key(request, progress_id)) or {})
+
+
 @login_required
 def add_comment(request, pk):
-    post_query = get_object_or_404(Post)
-    if request.user == post_query.author:
-        post = all_query(annotate_comment_count=False)
-    else:
-        post = is_published_query(annotate_comment_count=False)
-    post = get_object_or_404(post, pk=pk)
     form = CommentForm(request.POST or None)
-    if form.is_valid():
-        comment = form.save(commit=False)
-        comment.author = request.user
-        comment.post = post
-        comment.save()
-    return redirect('blog:post_detail', pk=pk)
+    with transaction.atomic():
+        if not visible_query(request.user).filter(pk=pk).exists():
+            raise Http404
+        if form.is_valid():
+            form.instance.author = request.user
+            form.instance.post_id = pk
+            comment = form.save()
+    if not is_ajax(request):
+        return redirect('blog:post_detail', pk=pk)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    html = render_to_string(
+        'includes/comment.html', {'comment': comment}, request)
+    return JsonResponse({'id': comment.id, 'html': html}, status=201)
 
 
 @login_required
@@ -0,0 +1,253 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-$gj2l)1p-j&_p&4vveg&+&axkbc58qst1^fcxwh0u7m4!x5kd4'
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host
+]
+
+INSTALLED_APPS = [
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'core.apps.CoreConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_bootstrap5',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.db.SQLiteWriteLockMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+            # Шаблоны разбираются один раз на процесс; wsgi.py и asgi.py
+            # прогревают кеш при запуске. В dev.py кеш отключается.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# База данных задаётся переменными окружения DJANGO_DB_*;
+# по умолчанию используется SQLite.
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'blogicum'),
+            'USER': os.environ.get('DJANGO_DB_USER', 'blogicum'),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DJANGO_DB_PORT', '5432'),
+            # Соединение живёт между запросами; проверку перед запросом
+            # выполняет core.db.check_connections.
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+            # За PgBouncer в режиме transaction именованные курсоры
+            # .iterator() не работают, их нужно отключить.
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get(
+                'DJANGO_DB_DISABLE_SERVER_SIDE_CURSORS') == '1',
+            'OPTIONS': {
+                'connect_timeout': 5,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get(
+                'DJANGO_DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+        }
+    }
+
+# Настройки каждого соединения с SQLite: WAL позволяет читать во время
+# записи, а busy_timeout — ждать блокировку вместо ошибки.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Выполнять изменяющие запросы процесса по одному
+# (core.db.SQLiteWriteLockMiddleware); имеет смысл только для SQLite.
+SQLITE_WRITE_LOCK = os.environ.get('DJANGO_SQLITE_WRITE_LOCK') == '1'
+
+# Проверять постоянные соединения в начале каждого запроса.
+DB_HEALTH_CHECKS = True
+
+# Размер пакета строк для выгрузок через .iterator(): в PostgreSQL
+# строки читаются серверным курсором, а не загружаются все сразу.
+EXPORT_CHUNK_SIZE = 2000
+
+# Реализация поиска (blog.search): 'auto' выбирает FTS5 для SQLite
+# и tsvector для PostgreSQL, 'index' ищет по собственному индексу
+# в SEARCH_INDEX_DIR, 'simple' — без индекса.
+SEARCH_BACKEND = os.environ.get('DJANGO_SEARCH_BACKEND', 'auto')
+SEARCH_INDEX_DIR = Path(os.environ.get(
+    'DJANGO_SEARCH_INDEX_DIR', BASE_DIR / 'search_index'))
+# Журнал изменений больше этого размера сливается с индексом.
+SEARCH_INDEX_LOG_MAX_SIZE = 8 * 1024 * 1024
+SEARCH_INDEX_MAX_RESULTS = 1000
+# Диапазон id публикаций, который индексирует один процесс
+# manage.py rebuild_search_index.
+SEARCH_INDEX_CHUNK_SIZE = 20000
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+FEED_PAGE_CACHE_TIMEOUT = 60 * 5
+
+FEED_COUNT_CACHE_TIMEOUT = 60 * 60
+
+# Число публикаций в лентах RSS и Atom (blog.feeds).
+SYNDICATION_ITEMS = 20
+
+# Размер страницы JSON API (blog.api) по умолчанию и наибольший
+# размер, который можно запросить параметром ?limit=.
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 1000
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+
+STATIC_ROOT = BASE_DIR / 'static'
+
+# Имена с хешем содержимого и сжатые копии .gz/.br рядом с файлами.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Как подключать Bootstrap:
+# 'cdn' — тегом {% bootstrap_css %} с CDN;
+# 'local' — полный BOOTSTRAP_CSS из статики;
+# 'purged' — только BOOTSTRAP_PURGED_CSS (manage.py purge_bootstrap);
+# 'critical' — BOOTSTRAP_PURGED_CSS встраивается в страницу,
+# а полный файл подгружается без блокировки отрисовки.
+BOOTSTRAP_ASSETS = 'critical'
+BOOTSTRAP_CSS = 'css/bootstrap.min.css'
+BOOTSTRAP_PURGED_CSS = 'css/bootstrap.purged.min.css'
+
+# Срок кеширования файлов без хеша в имени; файлы с хешем
+# кешируются бессрочно.
+STATIC_FILES_MAX_AGE = 60 * 60
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static_dev',
+]
+
+MEDIA_URL = '/media/'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Keyset-пагинация лент по ?cursor= вместо ?page=
+BLOG_CURSOR_PAGINATION = False
+
+# Ограничения на изображения публикаций. Число пикселей проверяется
+# по заголовку файла до декодирования.
+POST_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+POST_IMAGE_MAX_PIXELS = 40_000_000
+# Сколько секунд неиспользуемый файл изображения хранится до удаления.
+POST_IMAGE_GC_GRACE = 60 * 60
+
+# Прогресс загрузки хранится в кеше, поэтому для нескольких процессов
+# нужен общий бэкенд кеша.
+UPLOAD_PROGRESS_TIMEOUT = 60 * 10
+
+# Очередь фоновых задач (manage.py runworker). В режиме TASKS_EAGER
+# задачи выполняются сразу после фиксации транзакции, без очереди.
+TASKS_EAGER = False
+TASKS_WORKER_PROCESSES = 2
+TASKS_POLL_INTERVAL = 1
+TASKS_MAX_ATTEMPTS = 3
+TASKS_RETRY_DELAY = 30
+TASKS_STALE_TIMEOUT = 60 * 10
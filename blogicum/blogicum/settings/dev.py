@@ -0,0 +1,21 @@
+import os
+from importlib.util import find_spec
+
+from .base import *  # noqa: F401, F403
+from .base import INSTALLED_APPS, MIDDLEWARE, TEMPLATE_LOADERS, TEMPLATES
+
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
+
+if DEBUG:
+    TEMPLATES[0]['OPTIONS']['loaders'] = TEMPLATE_LOADERS
+
+# django-debug-toolbar не входит в requirements.txt и подключается,
+# только если установлен.
+if DEBUG and find_spec('debug_toolbar') is not None:
+    INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+    MIDDLEWARE = [
+        *MIDDLEWARE, 'debug_toolbar.middleware.DebugToolbarMiddleware']
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
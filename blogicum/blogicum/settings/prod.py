@@ -0,0 +1,12 @@
+import os
+
+from .base import *  # noqa: F401, F403
+
+# Стек middleware и приложения берутся из base.py без изменений:
+# отладочные приложения подключает только dev.py.
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+SESSION_COOKIE_SECURE = os.environ.get('DJANGO_SECURE_COOKIES', '1') == '1'
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
@@ -1,7 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
@@ -24,8 +23,6 @@ urlpatterns = [
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
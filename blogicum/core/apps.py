@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core.db import check_connections, configure_sqlite
+        request_started.connect(check_connections)
+        connection_created.connect(configure_sqlite)
@@ -0,0 +1,88 @@
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, которые перестали отвечать.
+
+    В Django 3.2 нет настройки CONN_HEALTH_CHECKS, поэтому соединение,
+    оборванное сервером или балансировщиком между запросами, иначе
+    приводит к ошибке первого запроса к базе.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict['CONN_MAX_AGE']
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
+
+
+def begin_immediate(execute, sql, params, many, context):
+    """Открывает транзакции SQLite как BEGIN IMMEDIATE.
+
+    Django начинает транзакцию с BEGIN DEFERRED: при переходе от чтения
+    к записи SQLite сразу возвращает «database is locked», не дожидаясь
+    busy_timeout. BEGIN IMMEDIATE берёт блокировку записи в начале
+    транзакции, и конкурирующий писатель ждёт её busy_timeout.
+    """
+    if sql == 'BEGIN':
+        sql = 'BEGIN IMMEDIATE'
+    return execute(sql, params, many, context)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Выполняет SQLITE_PRAGMAS для каждого нового соединения с SQLite
+    и открывает его транзакции как BEGIN IMMEDIATE.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    # Обёртки хранятся в объекте соединения и переживают переподключение.
+    # Обёртка ставится первой: execute_wrapper() снимает последнюю
+    # из списка, даже если соединение открылось внутри него.
+    if begin_immediate not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, begin_immediate)
+
+
+class SQLiteWriteLockMiddleware:
+    """Выполняет записи в SQLite из потоков процесса по очереди.
+
+    SQLite допускает одного писателя. С BEGIN IMMEDIATE (begin_immediate)
+    писатели ждут друг друга внутри SQLite, опрашивая блокировку;
+    очередь в процессе передаёт её следующему потоку сразу.
+
+    Блокировка берётся на первом изменяющем запросе к базе и держится
+    до конца обработки запроса, поэтому загрузка файлов и чтение
+    не ждут очереди.
+    """
+    lock = threading.Lock()
+    write_statements = ('BEGIN', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        connection = connections['default']
+        if not settings.SQLITE_WRITE_LOCK or connection.vendor != 'sqlite':
+            return self.get_response(request)
+        held = []
+
+        def serialize_writes(execute, sql, params, many, context):
+            statement = sql.lstrip()[:7].upper()
+            if not held and statement.startswith(self.write_statements):
+                self.lock.acquire()
+                held.append(True)
+            return execute(sql, params, many, context)
+
+        try:
+            with connection.execute_wrapper(serialize_writes):
+                return self.get_response(request)
+        finally:
+            if held:
+                self.lock.release()
@@ -0,0 +1,47 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from core.purgecss import collect_classes, purge
+
+LICENSE_RE = re.compile(r'/\*!.*?\*/', re.S)
+# Классы, которые django_bootstrap5 добавляет при выводе форм,
+# кнопок и сообщений: в шаблонах проекта их нет.
+SAFELIST = {
+    'alert', 'alert-danger', 'alert-dismissible', 'btn', 'btn-close',
+    'btn-primary', 'col-form-label', 'fade', 'form-check',
+    'form-check-input', 'form-check-label', 'form-control', 'form-label',
+    'form-select', 'form-text', 'has-validation', 'input-group',
+    'input-group-text', 'invalid-feedback', 'is-invalid', 'is-valid',
+    'list-unstyled', 'mb-3', 'mt-1', 'row', 'show', 'text-danger',
+    'visually-hidden',
+}
+
+
+class Command(BaseCommand):
+    help = ('Собирает из bootstrap.min.css только правила для классов, '
+            'которые используются в шаблонах.')
+
+    def handle(self, *args, **options):
+        source = finders.find(settings.BOOTSTRAP_CSS)
+        if source is None:
+            raise CommandError(f'Файл {settings.BOOTSTRAP_CSS} не найден.')
+        source = Path(source)
+        templates = [
+            path.read_text(encoding='utf-8')
+            for path in Path(settings.TEMPLATES_DIR).rglob('*.html')
+        ]
+        classes = collect_classes(templates) | SAFELIST
+        css = source.read_text(encoding='utf-8')
+        license = LICENSE_RE.search(css)
+        purged = purge(css, classes)
+        if license:
+            purged = license.group() + purged
+        target = source.parent / Path(settings.BOOTSTRAP_PURGED_CSS).name
+        target.write_text(purged, encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(
+            f'{target.name}: {len(purged)} из {len(css)} байт, '
+            f'классов в шаблонах: {len(classes)}'))
@@ -0,0 +1,67 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.worker import requeue_stale, run_pending, work
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _worker(poll_interval):
+    stop = multiprocessing.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    work(poll_interval, stop.is_set)
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.TASKS_WORKER_PROCESSES,
+            help='Число процессов-обработчиков.')
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help='Пауза в секундах, когда очередь пуста.')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и завершиться.')
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь задач: {requeued}')
+        if options['once']:
+            done = run_pending()
+            self.stdout.write(
+                self.style.SUCCESS(f'Выполнено задач: {done}'))
+            return
+        # Дочерние процессы открывают собственные соединения с БД.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=_worker, args=(options['poll_interval'],),
+                daemon=True)
+            for _ in range(max(options['processes'], 1))
+        ]
+        for process in workers:
+            process.start()
+        signal.signal(signal.SIGTERM, _interrupt)
+        self.stdout.write(f'Запущено обработчиков: {len(workers)}')
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join()
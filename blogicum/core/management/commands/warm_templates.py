@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.templates import warm_templates
+
+
+class Command(BaseCommand):
+    help = ('Разбирает все шаблоны проекта: проверяет, что они '
+            'компилируются, и показывает время разбора.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        loaded, errors = warm_templates()
+        elapsed = (time.perf_counter() - started) * 1000
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        self.stdout.write(
+            f'Разобрано шаблонов: {loaded} за {elapsed:.0f} мс')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
@@ -0,0 +1,154 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Имя с хешем от ManifestStaticFilesStorage (style.0123456789ab.css)
+# или от ContentAddressedStorage (<sha256>.jpg, <sha256>_card.webp).
+HASHED_NAME_RE = re.compile(r'(\.[0-9a-f]{12}\.\w+$|^[0-9a-f]{64})')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def parse_range(header, size):
+    """Возвращает (начало, длина) для одного диапазона Range,
+    None для неподдерживаемого заголовка и False для недопустимого.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        length = min(int(end), size)
+        return (size - length, length) if length else False
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        return False
+    return start, end - start + 1
+
+
+class StaticFilesMiddleware:
+    """Отдаёт статику из STATIC_ROOT и загрузки из MEDIA_ROOT
+    без отдельного веб-сервера, под WSGI и ASGI.
+
+    Поддерживает ETag и Last-Modified, один диапазон Range, заранее
+    сжатые копии .br и .gz и бессрочное кеширование файлов, в имени
+    которых есть хеш содержимого.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            path = self.find_file(request.path_info)
+            if path is not None:
+                return self.serve(request, path)
+        return self.get_response(request)
+
+    def find_file(self, url_path):
+        roots = (
+            (settings.STATIC_URL, settings.STATIC_ROOT, True),
+            (settings.MEDIA_URL, settings.MEDIA_ROOT, False),
+        )
+        for prefix, root, is_static in roots:
+            if not prefix or prefix == '/' or not url_path.startswith(prefix):
+                continue
+            name = unquote(url_path[len(prefix):])
+            path = None
+            if root:
+                try:
+                    path = safe_join(root, name)
+                except SuspiciousFileOperation:
+                    return None
+            if is_static and settings.DEBUG and not (
+                    path and os.path.isfile(path)):
+                path = finders.find(name)
+            if path and os.path.isfile(path):
+                return path
+        return None
+
+    def select_encoding(self, request, path):
+        """Выбирает заранее сжатую копию файла по Accept-Encoding."""
+        # Диапазоны отдаются только из несжатого файла.
+        if request.META.get('HTTP_RANGE') or mimetypes.guess_type(path)[1]:
+            return path, None
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        for name, extension in ENCODINGS:
+            if name in accept and os.path.isfile(path + extension):
+                return path + extension, name
+        return path, None
+
+    def serve(self, request, path):
+        content_type = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        cache_control = (
+            IMMUTABLE if HASHED_NAME_RE.search(posixpath.basename(path))
+            else f'public, max-age={settings.STATIC_FILES_MAX_AGE}')
+        path, content_encoding = self.select_encoding(request, path)
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        headers = HttpResponse()
+        del headers['Content-Type']
+        headers['ETag'] = etag
+        headers['Last-Modified'] = http_date(stat.st_mtime)
+        headers['Accept-Ranges'] = 'bytes'
+        headers['Cache-Control'] = cache_control
+        if content_encoding:
+            headers['Content-Encoding'] = content_encoding
+        patch_vary_headers(headers, ('Accept-Encoding',))
+        conditional = get_conditional_response(
+            request, etag=etag, last_modified=int(stat.st_mtime),
+            response=headers)
+        if conditional is not headers:
+            return conditional
+
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        if range_header and request.META.get('HTTP_IF_RANGE', etag) == etag:
+            byte_range = parse_range(range_header, stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+            response['Content-Length'] = stat.st_size
+        elif byte_range:
+            start, length = byte_range
+            response = StreamingHttpResponse(
+                read_range(path, start, length), status=206,
+                content_type=content_type)
+            response['Content-Range'] = (
+                f'bytes {start}-{start + length - 1}/{stat.st_size}')
+            response['Content-Length'] = length
+        else:
+            response = FileResponse(
+                open(path, 'rb'), content_type=content_type)
+            del response['Content-Disposition']
+        for header, value in headers.items():
+            response[header] = value
+        return response
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class PublishedDateModel(models.Model):
@@ -10,3 +11,40 @@ class PublishedDateModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Task(models.Model):
+    """Фоновая задача, которую выполняет manage.py runworker."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Завершилась ошибкой'
+
+    name = models.CharField('Задача', max_length=128)
+    args = models.JSONField('Аргументы', default=list, blank=True)
+    status = models.CharField(
+        'Статус', max_length=16, choices=Status.choices,
+        default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    run_after = models.DateTimeField('Выполнить после', default=timezone.now)
+    created_at = models.DateTimeField('Добавлена', auto_now_add=True)
+    started_at = models.DateTimeField('Начата', null=True, blank=True)
+    finished_at = models.DateTimeField('Завершена', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after', 'id')
+        indexes = (
+            models.Index(
+                fields=('run_after', 'id'),
+                name='task_pending_idx',
+                condition=models.Q(status='pending')
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
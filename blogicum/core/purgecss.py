@@ -0,0 +1,104 @@
+"""Удаление из CSS правил для классов, которых нет в шаблонах."""
+import re
+
+CLASS_ATTRIBUTE_RE = re.compile(r'class\s*=\s*(["\'])(.*?)\1', re.S)
+TEMPLATE_TAG_RE = re.compile(r'{%.*?%}|{{.*?}}', re.S)
+CLASS_TOKEN_RE = re.compile(r'-?[_a-zA-Z][\w-]*')
+SELECTOR_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+# Правила внутри этих блоков не зависят от классов и сохраняются целиком.
+KEEP_AT_RULES = ('@font-face', '@keyframes', '@-webkit-keyframes', '@page')
+
+
+def collect_classes(sources):
+    """Собирает имена классов из атрибутов class в шаблонах.
+
+    Содержимое тегов шаблона внутри атрибута тоже учитывается:
+    в {% if %}active{% endif %} класс active стоит вне тега,
+    а строки в кавычках внутри тегов, например в
+    {% bootstrap_button button_class='btn-lg' %}, добавляются отдельно.
+    """
+    classes = set()
+    for source in sources:
+        for _, value in CLASS_ATTRIBUTE_RE.findall(source):
+            for tag in TEMPLATE_TAG_RE.findall(value):
+                for literal in re.findall(r'["\']([^"\']*)["\']', tag):
+                    classes.update(CLASS_TOKEN_RE.findall(literal))
+            classes.update(
+                CLASS_TOKEN_RE.findall(TEMPLATE_TAG_RE.sub(' ', value)))
+    return classes
+
+
+def split_blocks(css):
+    """Разбивает CSS на пары (прелюдия, тело) верхнего уровня.
+
+    Для @-правил без тела, например @charset, тело равно None.
+    """
+    blocks = []
+    depth = 0
+    start = 0
+    prelude = None
+    quote = None
+    for index, char in enumerate(css):
+        if quote:
+            if char == quote and css[index - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                prelude = css[start:index].strip()
+                start = index + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:index]))
+                start = index + 1
+        elif char == ';' and depth == 0:
+            blocks.append((css[start:index].strip(), None))
+            start = index + 1
+    return blocks
+
+
+def split_selectors(prelude):
+    selectors = []
+    depth = 0
+    current = ''
+    for char in prelude:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+    selectors.append(current)
+    return selectors
+
+
+def purge(css, classes):
+    """Возвращает CSS только с правилами, все классы которых есть
+    в множестве classes.
+    """
+    css = COMMENT_RE.sub('', css)
+    output = []
+    for prelude, body in split_blocks(css):
+        if body is None:
+            output.append(f'{prelude};')
+        elif prelude.startswith(KEEP_AT_RULES):
+            output.append(f'{prelude}{{{body}}}')
+        elif prelude.startswith('@'):
+            inner = purge(body, classes)
+            if inner:
+                output.append(f'{prelude}{{{inner}}}')
+        else:
+            selectors = [
+                selector for selector in split_selectors(prelude)
+                if set(SELECTOR_CLASS_RE.findall(selector)) <= classes
+            ]
+            if selectors:
+                output.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(output)
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import autodiscover_modules
+
+_registry = {}
+
+
+def task(name):
+    """Регистрирует функцию как фоновую задачу с именем name."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    if name not in _registry:
+        autodiscover_modules('tasks')
+    return _registry[name]
+
+
+def enqueue(name, *args):
+    """Ставит задачу в очередь после фиксации текущей транзакции.
+
+    Аргументы сохраняются в JSON, поэтому передавать нужно
+    первичные ключи и простые значения, а не объекты моделей.
+    """
+    from core.models import Task
+
+    def submit():
+        if settings.TASKS_EAGER:
+            get_task(name)(*args)
+        else:
+            Task.objects.create(name=name, args=list(args))
+
+    transaction.on_commit(submit)
@@ -0,0 +1,54 @@
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def iter_template_names(engine):
+    seen = set()
+    for directory in (*engine.dirs, *get_app_template_dirs('templates')):
+        directory = Path(directory)
+        for path in directory.rglob('*'):
+            if path.suffix not in TEMPLATE_EXTENSIONS:
+                continue
+            name = path.relative_to(directory).as_posix()
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+
+def warm_templates():
+    """Загружает и разбирает все шаблоны, чтобы cached loader
+    хранил их до первого запроса.
+
+    Возвращает число шаблонов и список пар (имя, ошибка).
+    """
+    loaded, errors = 0, []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in iter_template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except (TemplateSyntaxError, UnicodeDecodeError) as error:
+                errors.append((name, error))
+            else:
+                loaded += 1
+    return loaded, errors
+
+
+def warm_templates_on_startup():
+    """Прогревает кеш шаблонов, если включён cached loader."""
+    if settings.DEBUG:
+        return
+    loaded, errors = warm_templates()
+    for name, error in errors:
+        logger.warning('Шаблон %s не разобран: %s', name, error)
+    logger.info('Разобрано шаблонов: %s', loaded)
@@ -0,0 +1,54 @@
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+register = template.Library()
+
+
+def read_static(name):
+    if staticfiles_storage.exists(name):
+        with staticfiles_storage.open(name) as file:
+            return file.read().decode('utf-8')
+    path = finders.find(name)
+    if path is None:
+        return None
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+cached_read_static = lru_cache(maxsize=None)(read_static)
+
+
+def stylesheet(name):
+    return format_html('<link rel="stylesheet" href="{}">', static(name))
+
+
+@register.simple_tag
+def bootstrap_assets():
+    """Подключает Bootstrap в режиме из настройки BOOTSTRAP_ASSETS."""
+    mode = settings.BOOTSTRAP_ASSETS
+    if mode == 'cdn':
+        return bootstrap_css()
+    if mode == 'purged':
+        return stylesheet(settings.BOOTSTRAP_PURGED_CSS)
+    if mode == 'critical':
+        read = read_static if settings.DEBUG else cached_read_static
+        critical = read(settings.BOOTSTRAP_PURGED_CSS)
+        if critical is not None:
+            return format_html(
+                '<style>{}</style>'
+                '<link rel="preload" href="{}" as="style" '
+                'onload="this.onload=null;this.rel=\'stylesheet\'">'
+                '<noscript>{}</noscript>',
+                mark_safe(critical),
+                static(settings.BOOTSTRAP_CSS),
+                stylesheet(settings.BOOTSTRAP_CSS),
+            )
+    return stylesheet(settings.BOOTSTRAP_CSS)
@@ -0,0 +1,84 @@
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import Task
+from core.queue import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи, чей обработчик завершился аварийно."""
+    stale = timezone.now() - timedelta(seconds=settings.TASKS_STALE_TIMEOUT)
+    return Task.objects.filter(
+        status=Task.Status.RUNNING, started_at__lt=stale
+    ).update(status=Task.Status.PENDING)
+
+
+def claim():
+    """Забирает одну готовую задачу.
+
+    Задачу получает тот процесс, чей UPDATE изменил строку, поэтому
+    несколько обработчиков не выполнят одну задачу дважды даже там,
+    где нет SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    pending = Task.objects.filter(
+        status=Task.Status.PENDING, run_after__lte=timezone.now())
+    for task in pending.only('pk')[:10]:
+        claimed = Task.objects.filter(
+            pk=task.pk, status=Task.Status.PENDING
+        ).update(
+            status=Task.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            started_at=timezone.now(),
+        )
+        if claimed:
+            return Task.objects.get(pk=task.pk)
+    return None
+
+
+def execute(task):
+    try:
+        get_task(task.name)(*task.args)
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', task)
+        task.last_error = traceback.format_exc()
+        if task.attempts < settings.TASKS_MAX_ATTEMPTS:
+            task.status = Task.Status.PENDING
+            task.run_after = timezone.now() + timedelta(
+                seconds=settings.TASKS_RETRY_DELAY * task.attempts)
+        else:
+            task.status = Task.Status.FAILED
+    else:
+        task.status = Task.Status.DONE
+    task.finished_at = timezone.now()
+    task.save(update_fields=(
+        'status', 'run_after', 'finished_at', 'last_error'))
+
+
+def run_pending(limit=None):
+    """Выполняет готовые задачи и возвращает их число."""
+    done = 0
+    while limit is None or done < limit:
+        task = claim()
+        if task is None:
+            break
+        execute(task)
+        done += 1
+    return done
+
+
+def work(poll_interval, should_stop=lambda: False):
+    autodiscover_modules('tasks')
+    while not should_stop():
+        close_old_connections()
+        if not run_pending(limit=100):
+            time.sleep(poll_interval)
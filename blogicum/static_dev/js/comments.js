@@ -0,0 +1,66 @@
+// Отправляет комментарий без перезагрузки страницы и подгружает
+// следующие страницы комментариев по кнопке «Показать ещё».
+document.addEventListener('DOMContentLoaded', function () {
+  var comments = document.getElementById('comments');
+  if (!comments || !window.fetch) {
+    return;
+  }
+
+  function request(url, options) {
+    options = options || {};
+    options.headers = {'X-Requested-With': 'XMLHttpRequest'};
+    options.credentials = 'same-origin';
+    return fetch(url, options).then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.status);
+      }
+      return response.json();
+    });
+  }
+
+  // Новый комментарий может прийти и со следующей страницей,
+  // поэтому уже показанные комментарии не добавляются повторно.
+  function append(html) {
+    var template = document.createElement('template');
+    template.innerHTML = html;
+    Array.prototype.forEach.call(
+      template.content.querySelectorAll('[data-comment-id]'),
+      function (comment) {
+        var selector = '[data-comment-id="' + comment.dataset.commentId + '"]';
+        if (!comments.querySelector(selector)) {
+          comments.appendChild(comment);
+        }
+      }
+    );
+  }
+
+  var form = document.querySelector('[data-comment-form]');
+  if (form) {
+    form.addEventListener('submit', function (event) {
+      event.preventDefault();
+      request(form.action, {method: 'POST', body: new FormData(form)})
+        .then(function (data) {
+          append(data.html);
+          form.reset();
+        })
+        .catch(function () {
+          form.submit();
+        });
+    });
+  }
+
+  var more = document.querySelector('[data-comments-more]');
+  if (more) {
+    more.addEventListener('click', function (event) {
+      event.preventDefault();
+      request(more.href).then(function (data) {
+        append(data.html);
+        if (data.next) {
+          more.href = more.href.split('?')[0] + '?cursor=' + data.next;
+        } else {
+          more.remove();
+        }
+      });
+    });
+  }
+});
@@ -0,0 +1,38 @@
+// Показывает прогресс загрузки изображения публикации: к адресу формы
+// добавляется X-Progress-ID, а сервер отдаёт число полученных байтов.
+document.addEventListener('DOMContentLoaded', function () {
+  var form = document.querySelector('[data-upload-progress]');
+  if (!form || !window.fetch) {
+    return;
+  }
+  var bar = form.querySelector('progress');
+
+  form.addEventListener('submit', function () {
+    var file = form.querySelector('input[type="file"]');
+    if (!file || !file.files.length) {
+      return;
+    }
+    var progressId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    var action = form.getAttribute('action') || window.location.pathname;
+    form.action = action.split('?')[0] + '?X-Progress-ID=' + progressId;
+    bar.hidden = false;
+
+    var url = form.dataset.uploadProgress + '?X-Progress-ID=' + progressId;
+    function poll() {
+      fetch(url, {credentials: 'same-origin'})
+        .then(function (response) {
+          return response.json();
+        })
+        .then(function (data) {
+          if (data.size) {
+            bar.max = data.size;
+            bar.value = data.received;
+          }
+          if (!data.done) {
+            setTimeout(poll, 500);
+          }
+        });
+    }
+    setTimeout(poll, 500);
+  });
+});
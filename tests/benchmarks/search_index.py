@@ -0,0 +1,118 @@
+"""Построение и запросы собственного поискового индекса (blog.search.index).
+
+Создаёт временную базу с синтетическими публикациями, строит индекс
+в один и в несколько процессов и измеряет время запросов разных видов.
+
+Запуск из корня репозитория:
+    python tests/benchmarks/search_index.py --posts 100000 --processes 4
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[2] / 'blogicum'
+STEMS = [
+    'путешеств', 'гор', 'мор', 'город', 'поезд', 'книг', 'рецепт', 'сад',
+    'река', 'лес', 'дорог', 'музык', 'фотограф', 'погод', 'зим', 'праздник',
+]
+ENDINGS = ['', 'а', 'ы', 'е', 'ам', 'ами', 'ах', 'ой', 'ие', 'ия', 'ию']
+QUERIES = {
+    'частое слово': 'путешествие',
+    'И': 'горы поезд',
+    'ИЛИ': 'река ИЛИ лес',
+    'фраза': '"зимняя дорога"',
+    'редкое слово': 'слово4321',
+}
+
+
+def make_words(size):
+    words = [stem + ending for stem in STEMS for ending in ENDINGS]
+    words += ['зимняя', 'дорога']
+    words += [f'слово{number}' for number in range(size - len(words))]
+    # Частоты слов убывают по закону Ципфа, как в обычных текстах.
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    return words, weights
+
+
+def fill(posts, words, weights):
+    from blog.models import Category, Post, User
+    from django.utils import timezone
+
+    author = User.objects.create(username='bench')
+    category = Category.objects.create(
+        title='Тест', slug='test', description='', is_published=True)
+    now = timezone.now()
+    random.seed(1)
+    for start in range(0, posts, 5000):
+        Post.objects.bulk_create(
+            Post(
+                title=' '.join(random.choices(words, weights, k=6)),
+                text=' '.join(random.choices(words, weights, k=80)),
+                pub_date=now, author=author, category=category,
+            )
+            for _ in range(start, min(start + 5000, posts))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--vocabulary', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp()
+    os.environ.update({
+        'DJANGO_ENV': 'dev',
+        'DJANGO_DEBUG': '0',
+        'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+        'DJANGO_DB_ENGINE': 'sqlite3',
+        'DJANGO_DB_NAME': str(Path(directory) / 'bench.sqlite3'),
+        'DJANGO_SEARCH_BACKEND': 'index',
+        'DJANGO_SEARCH_INDEX_DIR': str(Path(directory) / 'index'),
+    })
+    sys.path.insert(0, str(PROJECT_DIR))
+    import django
+    django.setup()
+    try:
+        run(args)
+    finally:
+        shutil.rmtree(directory)
+
+
+def run(args):
+    from django.core.management import call_command
+
+    from blog.search.index import get_index, rebuild
+    from blog.search.query import parse_query
+
+    call_command('migrate', verbosity=0)
+    fill(args.posts, *make_words(args.vocabulary))
+    print(f'Публикаций: {args.posts}')
+    for processes in sorted({1, args.processes}):
+        started = time.perf_counter()
+        rebuild(processes)
+        print(f'Построение, процессов {processes}: '
+              f'{time.perf_counter() - started:.1f} с')
+    index = get_index()
+    index.search(parse_query('прогрев'), 1000)
+    print(f'{"запрос":<14}{"найдено":>9}{"медиана, мс":>13}')
+    for name, query in QUERIES.items():
+        groups = parse_query(query)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            found = index.search(groups, 1000)
+            timings.append(time.perf_counter() - started)
+        print(f'{name:<14}{len(found):>9}'
+              f'{statistics.median(timings) * 1000:>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Сравнение профилей настроек dev и prod.
+
+Для каждого профиля в отдельном процессе измеряются время запуска
+(импорт blogicum.wsgi: настройки, приложения, middleware, URL-схема)
+и среднее время запроса к /pages/about/ с внешнего IP-адреса.
+
+Запуск из корня репозитория:
+    python tests/benchmarks/settings_profiles.py --requests 500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[2] / 'blogicum'
+URL = '/pages/about/'
+
+
+def measure(requests):
+    sys.path.insert(0, str(PROJECT_DIR))
+    started = time.perf_counter()
+    import blogicum.wsgi  # noqa: F401
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    startup = time.perf_counter() - started
+
+    from django.conf import settings
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    setup_test_environment(debug=settings.DEBUG)
+    client = Client(REMOTE_ADDR='10.0.0.1')
+    assert client.get(URL).status_code == 200
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(URL)
+    per_request = (time.perf_counter() - started) / requests
+    return {
+        'startup_ms': startup * 1000,
+        'request_ms': per_request * 1000,
+        'middleware': len(settings.MIDDLEWARE),
+        'apps': len(settings.INSTALLED_APPS),
+        'modules': len(sys.modules),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(measure(args.requests)))
+        return
+    print(f'{"профиль":<8}{"запуск, мс":>12}{"запрос, мс":>12}'
+          f'{"middleware":>12}{"приложений":>12}{"модулей":>10}')
+    for profile in ('dev', 'prod'):
+        environ = {
+            **os.environ,
+            'DJANGO_ENV': profile,
+            'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+            'DJANGO_SECRET_KEY': os.environ.get(
+                'DJANGO_SECRET_KEY', 'benchmark'),
+        }
+        output = subprocess.run(
+            [sys.executable, __file__, '--child',
+             '--requests', str(args.requests)],
+            env=environ, cwd=PROJECT_DIR, check=True,
+            capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f'{profile:<8}{result["startup_ms"]:>12.1f}'
+              f'{result["request_ms"]:>12.2f}{result["middleware"]:>12}'
+              f'{result["apps"]:>12}{result["modules"]:>10}')
+
+
+if __name__ == '__main__':
+    main()
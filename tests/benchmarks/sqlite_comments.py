@@ -0,0 +1,119 @@
+"""Пропускная способность add_comment на SQLite при параллельной записи.
+
+Сравниваются три режима, каждый в отдельном процессе с новой базой:
+настройки SQLite по умолчанию, SQLITE_PRAGMAS (WAL, busy_timeout и др.)
+и SQLITE_PRAGMAS вместе с SQLiteWriteLockMiddleware.
+
+Запуск из корня репозитория:
+    python tests/benchmarks/sqlite_comments.py --threads 8 --comments 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[2] / 'blogicum'
+MODES = {
+    'default': {'pragmas': False, 'lock': False},
+    'pragmas': {'pragmas': True, 'lock': False},
+    'pragmas+lock': {'pragmas': True, 'lock': True},
+}
+
+
+def measure(mode, threads, comments):
+    sys.path.insert(0, str(PROJECT_DIR))
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.utils import timezone
+    from mixer.backend.django import mixer
+
+    if not MODES[mode]['pragmas']:
+        settings.SQLITE_PRAGMAS = {}
+    settings.SQLITE_WRITE_LOCK = MODES[mode]['lock']
+    setup_test_environment(debug=False)
+    call_command('migrate', verbosity=0)
+    post = mixer.blend(
+        'blog.Post', is_published=True, pub_date=timezone.now(),
+        category__is_published=True)
+    clients = []
+    for _ in range(threads):
+        client = Client()
+        client.force_login(mixer.blend('auth.User'))
+        clients.append(client)
+    connection.close()
+
+    errors = []
+    url = f'/posts/{post.pk}/comment/'
+
+    def write(client):
+        from django.db import connection
+        for number in range(comments):
+            try:
+                client.post(url, {'text': f'Комментарий {number}'})
+            except OperationalError as error:
+                errors.append(str(error))
+        connection.close()
+
+    workers = [
+        threading.Thread(target=write, args=(client,)) for client in clients]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    from blog.models import Comment
+    saved = Comment.objects.count()
+    return {
+        'saved': saved,
+        'errors': len(errors),
+        'per_second': saved / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--comments', type=int, default=50)
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.threads, args.comments)))
+        return
+    total = args.threads * args.comments
+    print(f'{args.threads} потоков по {args.comments} комментариев')
+    print(f'{"режим":<14}{"сохранено":>11}{"ошибок":>8}{"в секунду":>11}')
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            environ = {
+                **os.environ,
+                'DJANGO_ENV': 'dev',
+                'DJANGO_DEBUG': '0',
+                'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+                'DJANGO_DB_ENGINE': 'sqlite3',
+                'DJANGO_DB_NAME': str(Path(directory) / 'bench.sqlite3'),
+            }
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode,
+                 '--threads', str(args.threads),
+                 '--comments', str(args.comments)],
+                env=environ, cwd=PROJECT_DIR, check=True,
+                capture_output=True, text=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f'{mode:<14}{result["saved"]:>6}/{total:<4}'
+              f'{result["errors"]:>8}{result["per_second"]:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
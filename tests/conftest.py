@@ -3,6 +3,7 @@ import re
 import time
 from http import HTTPStatus
 from inspect import getsource
+from io import BytesIO
 from pathlib import Path
 from typing import (
     Iterable,
@@ -19,12 +20,14 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
+from PIL import Image
 
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
@@ -133,6 +136,26 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_GC_GRACE = 0
+    return tmp_path
+
+
+@pytest.fixture
+def image_upload():
+    def make(size=(50, 50), image_format="PNG", exif=None):
+        buffer = BytesIO()
+        options = {} if exif is None else {"exif": exif.tobytes()}
+        Image.new("RGB", size, "blue").save(buffer, image_format, **options)
+        return SimpleUploadedFile(
+            f"image.{image_format.lower()}", buffer.getvalue(),
+            Image.MIME[image_format]
+        )
+    return make
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
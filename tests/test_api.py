@@ -0,0 +1,153 @@
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    now = timezone.now()
+    published = [
+        mixer.blend(
+            'blog.Post', title=f'Публикация {number}', author=user,
+            category=published_category, is_published=True, location=None,
+            pub_date=now - timedelta(hours=number))
+        for number in range(5)
+    ]
+    mixer.blend(
+        'blog.Post', title='Скрытая', author=user, location=None,
+        category=published_category, is_published=False,
+        pub_date=now - timedelta(days=1))
+    return published
+
+
+def read(response):
+    content = b''.join(response.streaming_content)
+    return json.loads(content.decode('utf-8'))
+
+
+def test_post_list_pages_with_cursor(client, posts):
+    response = client.get('/api/v1/posts/?limit=2')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/json'
+    assert response.streaming
+    titles = []
+    data = read(response)
+    while True:
+        assert len(data['results']) <= 2
+        titles += [post['title'] for post in data['results']]
+        if data['next'] is None:
+            break
+        data = read(client.get(
+            f'/api/v1/posts/?limit=2&cursor={data["next"]}'))
+    assert titles == [post.title for post in posts]
+
+
+def test_sparse_fields_load_only_needed_columns(
+        client, posts, django_assert_num_queries):
+    # Проверка ETag и сам список.
+    with django_assert_num_queries(2) as context:
+        data = read(client.get('/api/v1/posts/?fields=id,title'))
+    assert data['results'][0] == {'id': posts[0].pk, 'title': posts[0].title}
+    sql = context.captured_queries[-1]['sql']
+    assert '"text"' not in sql and 'auth_user' not in sql
+
+    data = read(client.get('/api/v1/posts/?fields=author,category'))
+    assert data['results'][0] == {
+        'author': posts[0].author.username,
+        'category': posts[0].category.slug,
+    }
+
+
+@pytest.mark.parametrize('query', [
+    'fields=password', 'fields=', 'limit=0', 'limit=100000', 'cursor=плохой',
+])
+def test_invalid_parameters(client, posts, query):
+    response = client.get(f'/api/v1/posts/?{query}')
+    assert response.status_code == 400
+    assert 'error' in json.loads(response.content)
+
+
+def test_out_of_range_cursor(client, posts):
+    payload = json.dumps({'v': ['2020-01-01T00:00:00+00:00', '1' + '0' * 30]})
+    cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+    response = client.get(f'/api/v1/posts/?cursor={cursor}')
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_query_runs_before_response(
+        client, posts, django_assert_num_queries):
+    # Запрос списка выполняется до того, как отдан заголовок ответа.
+    with django_assert_num_queries(2):
+        response = client.get('/api/v1/posts/')
+    with django_assert_num_queries(0):
+        read(response)
+
+
+def test_post_detail(client, posts):
+    post = posts[0]
+    response = client.get(f'/api/v1/posts/{post.pk}/')
+    assert response.status_code == 200
+    data = response.json()
+    assert data['text'] == post.text
+    assert data['url'] == f'/posts/{post.pk}/'
+    not_modified = client.get(
+        f'/api/v1/posts/{post.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == 304
+
+
+def test_hidden_post_is_not_found(client, posts):
+    hidden = type(posts[0]).objects.get(is_published=False)
+    for url in (f'/api/v1/posts/{hidden.pk}/',
+                f'/api/v1/posts/{hidden.pk}/comments/'):
+        response = client.get(url)
+        assert response.status_code == 404
+        assert 'error' in response.json()
+
+
+def test_comments(client, mixer, posts):
+    post = posts[0]
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    response = client.get(f'/api/v1/posts/{post.pk}/comments/?limit=2')
+    data = read(response)
+    assert [comment['id'] for comment in data['results']] == [
+        comment.pk for comment in comments[:2]]
+    assert data['next']
+    not_modified = client.get(
+        f'/api/v1/posts/{post.pk}/comments/?limit=2',
+        HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == 304
+
+
+def test_category_posts(client, mixer, posts):
+    category = posts[0].category
+    data = read(client.get(f'/api/v1/categories/{category.slug}/posts/'))
+    assert len(data['results']) == len(posts)
+    hidden = mixer.blend('blog.Category', is_published=False)
+    assert client.get(
+        f'/api/v1/categories/{hidden.slug}/posts/').status_code == 404
+
+
+def test_list_etag_changes_with_posts(client, posts):
+    response = client.get('/api/v1/posts/')
+    not_modified = client.get(
+        '/api/v1/posts/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == 304
+    posts[0].title = 'Новый заголовок'
+    posts[0].save()
+    changed = client.get('/api/v1/posts/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert changed.status_code == 200
+    assert read(changed)['results'][0]['title'] == 'Новый заголовок'
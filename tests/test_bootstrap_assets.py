@@ -0,0 +1,31 @@
+import pytest
+
+from core.purgecss import collect_classes, purge
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_purge_keeps_only_used_classes():
+    classes = collect_classes([
+        '<div class="card {% if x %}active{% endif %}">',
+        "<a class=\"{% bootstrap_classes 'btn-lg' %}\">",
+    ])
+    assert classes == {'card', 'active', 'btn-lg'}
+    css = (
+        '@charset "UTF-8";body{margin:0}.card{display:flex}.table{color:red}'
+        '.card.active,.table .card{color:blue}'
+        '@media (min-width:576px){.card{padding:0}.table{padding:0}}'
+        '@media print{.table{display:none}}'
+    )
+    assert purge(css, classes) == (
+        '@charset "UTF-8";body{margin:0}.card{display:flex}'
+        '.card.active{color:blue}@media (min-width:576px){.card{padding:0}}'
+    )
+
+
+def test_critical_css_is_inlined(client, settings):
+    settings.BOOTSTRAP_ASSETS = 'critical'
+    content = client.get('/').content.decode('utf-8')
+    assert '<style>' in content and '.card{' in content
+    assert 'cdn.jsdelivr.net' not in content
+    assert 'rel="preload" href="/static/css/bootstrap.min.css"' in content
@@ -0,0 +1,99 @@
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_post_card_is_cached_until_post_changes(
+        client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in client.get('/').content.decode('utf-8')
+
+    type(post).objects.filter(pk=post.pk).update(title='Обход сигналов')
+    assert 'Обход сигналов' not in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что карточка публикации берётся из кеша.'
+    )
+
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что кеш карточки сбрасывается при сохранении публикации.'
+    )
+
+
+def test_post_card_cache_is_invalidated_by_related_objects(
+        client, post_with_published_location):
+    post = post_with_published_location
+    client.get('/')
+
+    post.category.title = 'Другая категория'
+    post.category.save()
+    post.author.first_name = 'Другоеимя'
+    post.author.save()
+    content = client.get('/').content.decode('utf-8')
+    assert 'Другая категория' in content and 'Другоеимя' in content, (
+        'Убедитесь, что кеш карточки сбрасывается при изменении категории'
+        ' и автора публикации.'
+    )
+
+
+def test_anonymous_index_page_is_cached(
+        client, user_client, post_with_published_location):
+    post = post_with_published_location
+    client.get('/')
+    # bulk_create не отправляет сигналы, поэтому кеш не сбрасывается.
+    type(post).objects.bulk_create([type(post)(
+        title='Без сигналов',
+        text=post.text,
+        pub_date=post.pub_date,
+        author=post.author,
+        category=post.category,
+    )])
+    assert 'Без сигналов' not in client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что главная страница кешируется для анонимных'
+        ' пользователей.'
+    )
+    assert 'Без сигналов' in user_client.get('/').content.decode('utf-8'), (
+        'Убедитесь, что авторизованным пользователям страница не отдаётся'
+        ' из кеша.'
+    )
+
+    post.title = 'Новый заголовок'
+    post.save()
+    content = client.get('/').content.decode('utf-8')
+    assert 'Новый заголовок' in content and 'Без сигналов' in content, (
+        'Убедитесь, что кеш страниц сбрасывается при сохранении публикации.'
+    )
+
+
+def test_anonymous_page_cache_expires_before_scheduled_post(
+        client, future_posts):
+    from blog.cache import feed_cache_timeout, seconds_until_next_publication
+    next_publication = seconds_until_next_publication()
+    assert next_publication is not None
+    assert feed_cache_timeout(10 ** 6) <= next_publication, (
+        'Убедитесь, что кеш страниц живёт не дольше, чем до ближайшей'
+        ' отложенной публикации.'
+    )
+
+
+def test_feed_count_is_cached(
+        user_client, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    count = user_client.get('/').context['paginator'].count
+    type(posts[0]).objects.filter(pk=posts[0].pk).update(is_published=False)
+    assert user_client.get('/').context['paginator'].count == count, (
+        'Убедитесь, что число публикаций в ленте берётся из кеша.'
+    )
+    posts[1].save()
+    assert user_client.get('/').context['paginator'].count == count - 1, (
+        'Убедитесь, что кеш числа публикаций сбрасывается при сохранении'
+        ' публикации.'
+    )
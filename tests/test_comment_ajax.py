@@ -0,0 +1,72 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+AJAX_HEADERS = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+def test_add_comment_with_several_posts(
+        user_client, post_with_published_location, post_of_another_author):
+    post = post_of_another_author
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Комментарий'})
+    assert response.status_code == 302
+    assert post.comments.filter(text='Комментарий').exists(), (
+        'Убедитесь, что комментарий добавляется к публикации из адреса,'
+        ' даже если публикаций несколько.'
+    )
+
+
+def test_add_comment_ajax_returns_fragment(
+        user_client, post_of_another_author):
+    post = post_of_another_author
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Через AJAX'},
+        **AJAX_HEADERS)
+    assert response.status_code == 201
+    data = response.json()
+    assert 'Через AJAX' in data['html'], (
+        'Убедитесь, что в ответ на AJAX-запрос возвращается HTML-фрагмент'
+        ' нового комментария.'
+    )
+    assert post.comments.filter(pk=data['id']).exists()
+
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': ''}, **AJAX_HEADERS)
+    assert response.status_code == 400
+    assert 'text' in response.json()['errors']
+
+
+def test_add_comment_to_hidden_post(
+        another_user_client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    response = another_user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Комментарий'})
+    assert response.status_code == 404
+    assert not post.comments.exists()
+
+
+def test_comments_are_paginated(client, mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(12).blend('blog.Comment', post=post)
+    response = client.get(f'/posts/{post.id}/')
+    page = response.context['comments']
+    assert len(page) == 10 and page.has_next(), (
+        'Убедитесь, что на странице публикации выводится только первая'
+        ' страница комментариев.'
+    )
+
+    url = f'/posts/{post.id}/comments/?cursor={page.next_cursor}'
+    data = client.get(url, **AJAX_HEADERS).json()
+    assert data['next'] is None
+    assert data['html'].count('data-comment-id') == 2, (
+        'Убедитесь, что следующая страница комментариев отдаётся'
+        ' по адресу posts/<pk>/comments/.'
+    )
+    assert client.get(url).status_code == 200
+
+
+def test_comments_of_hidden_post(
+        client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    assert client.get(f'/posts/{post.id}/comments/').status_code == 404
@@ -0,0 +1,52 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def comment_count(post):
+    return Post.objects.get(pk=post.pk).comment_count
+
+
+def test_count_follows_add_and_delete_comment(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.pk}/comment/', {'text': 'Первый'})
+    user_client.post(f'/posts/{post.pk}/comment/', {'text': 'Второй'})
+    assert comment_count(post) == 2, (
+        'Убедитесь, что счётчик комментариев растёт при добавлении'
+        ' комментария.'
+    )
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f'/posts/{post.pk}/delete_comment/{comment.pk}')
+    assert comment_count(post) == 1, (
+        'Убедитесь, что счётчик комментариев уменьшается при удалении'
+        ' комментария.'
+    )
+
+
+def test_count_follows_admin_delete(
+        admin_client, mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    assert comment_count(post) == 3
+    admin_client.post(
+        f'/admin/blog/comment/{comments[0].pk}/delete/', {'post': 'yes'})
+    assert comment_count(post) == 2
+    admin_client.post('/admin/blog/comment/', {
+        'action': 'delete_selected',
+        '_selected_action': [comment.pk for comment in comments[1:]],
+        'post': 'yes',
+    })
+    assert not Comment.objects.exists()
+    assert comment_count(post) == 0
+
+
+def test_rebuild_comment_count(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=10)
+    call_command('rebuild_comment_count')
+    assert comment_count(post) == 2
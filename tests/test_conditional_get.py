@@ -0,0 +1,99 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.cache import new_stamp, stamp_time
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', title='Опубликованная', author=user,
+        category=published_category, is_published=True, location=None,
+        pub_date=timezone.now() - timedelta(days=1))
+
+
+@pytest.mark.parametrize('url', [
+    '/',
+    '/posts/{pk}/',
+    '/category/{category}/',
+    '/profile/{username}/',
+])
+def test_repeat_request_is_not_modified(
+        client, post, url, django_assert_num_queries):
+    url = url.format(
+        pk=post.pk, category=post.category.slug,
+        username=post.author.username)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+    with django_assert_num_queries(1):
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == 304
+    not_modified = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert not_modified.status_code == 304
+
+
+def test_new_comment_changes_post_etag(client, mixer, post):
+    response = client.get(f'/posts/{post.pk}/')
+    mixer.blend('blog.Comment', post=post)
+    changed = client.get(
+        f'/posts/{post.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert changed.status_code == 200
+    assert changed['ETag'] != response['ETag']
+
+
+def test_version_stamp_keeps_creation_time():
+    before = timezone.now()
+    moment = stamp_time(new_stamp())
+    assert before - timedelta(seconds=1) <= moment <= timezone.now()
+    assert stamp_time(uuid4().hex) is None
+
+
+def test_hidden_post_is_not_found_despite_etag(
+        client, user_client, post):
+    response = user_client.get(f'/posts/{post.pk}/')
+    type(post).objects.filter(pk=post.pk).update(is_published=False)
+    hidden = client.get(
+        f'/posts/{post.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert hidden.status_code == 404
+
+
+def test_etag_depends_on_user(client, user_client, post):
+    anonymous = client.get(f'/posts/{post.pk}/')
+    author = user_client.get(f'/posts/{post.pk}/')
+    assert anonymous['ETag'] != author['ETag']
+    assert not author.has_header('Last-Modified'), (
+        'Страница зависит от пользователя, поэтому одной даты изменения'
+        ' для условного запроса недостаточно.'
+    )
+    response = user_client.get(
+        f'/posts/{post.pk}/', HTTP_IF_NONE_MATCH=anonymous['ETag'])
+    assert response.status_code == 200
+
+
+def test_scheduled_publication_changes_index_etag(client, post):
+    later = type(post).objects.create(
+        title='Отложенная', text='Текст', author=post.author,
+        category=post.category, pub_date=timezone.now() + timedelta(days=1))
+    response = client.get('/')
+    # Время публикации наступает без сохранения и сигналов.
+    type(post).objects.filter(pk=later.pk).update(
+        pub_date=timezone.now() - timedelta(hours=1))
+    changed = client.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert changed.status_code == 200
+    assert changed['ETag'] != response['ETag']
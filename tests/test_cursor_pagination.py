@@ -0,0 +1,72 @@
+import base64
+import json
+import re
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_cursor(content, label):
+    match = re.search(
+        r'href="\?cursor=([\w-]+)">\s*' + re.escape(label), content)
+    return match.group(1) if match else None
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_index_cursor_pagination(
+        client, many_posts_with_published_locations):
+    response = client.get('/')
+    first_page = list(response.context['page_obj'])
+    assert len(first_page) == N_PER_PAGE, (
+        'Убедитесь, что в режиме курсорной пагинации на странице выводится'
+        f' {N_PER_PAGE} публикаций.'
+    )
+    content = response.content.decode('utf-8')
+    next_cursor = get_cursor(content, '>>')
+    assert next_cursor, (
+        'Убедитесь, что в режиме курсорной пагинации выводится ссылка'
+        ' на следующую страницу.'
+    )
+
+    response = client.get(f'/?cursor={next_cursor}')
+    second_page = list(response.context['page_obj'])
+    assert len(second_page) == N_PER_PAGE
+    assert not set(first_page) & set(second_page), (
+        'Убедитесь, что страницы курсорной пагинации не пересекаются.'
+    )
+    assert [post.pub_date for post in first_page + second_page] == sorted(
+        (post.pub_date for post in first_page + second_page), reverse=True)
+
+    content = response.content.decode('utf-8')
+    assert get_cursor(content, '>>') is None
+    previous_cursor = get_cursor(content, '<<')
+    response = client.get(f'/?cursor={previous_cursor}')
+    assert list(response.context['page_obj']) == first_page, (
+        'Убедитесь, что ссылка на предыдущую страницу возвращает к первой'
+        ' странице ленты.'
+    )
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_invalid_cursor(client, many_posts_with_published_locations):
+    response = client.get('/?cursor=not-a-cursor')
+    assert response.status_code == 404
+
+
+def make_cursor(values):
+    payload = json.dumps({'v': values, 'r': False}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_out_of_range_cursor(client, many_posts_with_published_locations):
+    cursor = make_cursor(['2020-01-01T00:00:00+00:00', '1' + '0' * 30])
+    assert client.get(f'/?cursor={cursor}').status_code == 404
+    post = many_posts_with_published_locations[0]
+    cursor = make_cursor(['2020-01-01T00:00:00+00:00', str(2 ** 63)])
+    response = client.get(f'/posts/{post.pk}/comments/?cursor={cursor}')
+    assert response.status_code == 404
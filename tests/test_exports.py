@@ -0,0 +1,30 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_export_posts(settings, mixer, user, published_category):
+    settings.EXPORT_CHUNK_SIZE = 2
+    posts = mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category)
+    output = StringIO()
+    call_command('export_posts', stdout=output)
+    rows = list(csv.reader(StringIO(output.getvalue())))
+    assert rows[0][:2] == ['id', 'title']
+    assert [int(row[0]) for row in rows[1:]] == [post.pk for post in posts]
+    assert rows[1][4] == user.username
+
+
+def test_admin_export_action(admin_client, mixer, user):
+    post = mixer.blend('blog.Post', author=user)
+    response = admin_client.post('/admin/blog/post/', {
+        'action': 'export_csv',
+        '_selected_action': [post.pk],
+    })
+    assert response['Content-Type'] == 'text/csv'
+    content = b''.join(response.streaming_content).decode('utf-8')
+    assert post.title in content
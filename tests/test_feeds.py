@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    def make(title, **kwargs):
+        kwargs.setdefault('is_published', True)
+        kwargs.setdefault('pub_date', timezone.now() - timedelta(days=1))
+        return mixer.blend(
+            'blog.Post', title=title, author=user,
+            category=published_category, **kwargs)
+    return make('Опубликованная'), make('Скрытая', is_published=False)
+
+
+@pytest.mark.parametrize('url', [
+    '/feeds/rss/',
+    '/feeds/atom/',
+    '/category/{category}/rss/',
+    '/category/{category}/atom/',
+    '/profile/{username}/rss/',
+    '/profile/{username}/atom/',
+])
+def test_feed_lists_published_posts(client, posts, url):
+    published = posts[0]
+    response = client.get(url.format(
+        category=published.category.slug, username=published.author.username))
+    assert response.status_code == 200
+    content = response.content.decode('utf-8')
+    assert 'Опубликованная' in content
+    assert 'Скрытая' not in content
+    assert f'/posts/{published.pk}/' in content
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+
+
+def test_unpublished_category_feed_is_not_found(client, mixer):
+    category = mixer.blend('blog.Category', is_published=False)
+    assert client.get(f'/category/{category.slug}/rss/').status_code == 404
+
+
+def test_conditional_get_skips_queries(
+        client, posts, django_assert_num_queries):
+    response = client.get('/feeds/rss/')
+    with django_assert_num_queries(0):
+        not_modified = client.get(
+            '/feeds/rss/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert not_modified.status_code == 304
+    with django_assert_num_queries(0):
+        not_modified = client.get(
+            '/feeds/rss/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert not_modified.status_code == 304
+
+
+def test_new_comment_changes_validators(client, mixer, posts):
+    response = client.get('/feeds/rss/')
+    mixer.blend(
+        'blog.Comment', post=posts[0],
+        created_at=timezone.now() + timedelta(minutes=1))
+    changed = client.get('/feeds/rss/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert changed.status_code == 200
+    assert changed['ETag'] != response['ETag']
+    assert changed['Last-Modified'] != response['Last-Modified']
@@ -0,0 +1,65 @@
+import re
+
+import pytest
+from django.db import connection
+
+from blog.models import Comment
+from blog.querysets import list_query
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='План запроса проверяется для SQLite.'
+    ),
+]
+
+
+def assert_uses_index(query_set, table, page_name):
+    plan = query_set.explain()
+    table_steps = [
+        line for line in plan.splitlines()
+        if re.search(rf'\b{table}\b', line)
+    ]
+    assert table_steps and all(
+        'USING INDEX' in line or 'USING COVERING INDEX' in line
+        for line in table_steps
+    ), (
+        f'Убедитесь, что запрос для {page_name} читает `{table}` по индексу.'
+        f' План запроса:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Убедитесь, что запрос для {page_name} сортируется по индексу,'
+        f' а не во временном B-дереве. План запроса:\n{plan}'
+    )
+
+
+def test_index_page_query_uses_index():
+    assert_uses_index(
+        list_query()[:10], 'blog_post', 'главной страницы')
+
+
+def test_category_page_query_uses_index(published_category):
+    assert_uses_index(
+        list_query().filter(category=published_category)[:10],
+        'blog_post', 'страницы категории'
+    )
+
+
+def test_profile_page_queries_use_index(user):
+    assert_uses_index(
+        list_query().filter(author=user)[:10],
+        'blog_post', 'чужой страницы пользователя'
+    )
+    assert_uses_index(
+        list_query(published=False).filter(author=user)[:10],
+        'blog_post', 'своей страницы пользователя'
+    )
+
+
+def test_post_comments_query_uses_index(post_with_published_location):
+    assert_uses_index(
+        Comment.objects.filter(
+            post=post_with_published_location).select_related('author'),
+        'blog_comment', 'комментариев к публикации'
+    )
@@ -0,0 +1,43 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+DETAIL_PAGE_QUERIES = 2
+
+
+def test_post_detail_query_count(
+        client, django_assert_num_queries, post_with_published_location,
+        mixer):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    # Публикация с автором, категорией и местом и все комментарии
+    # с авторами загружаются не более чем двумя запросами.
+    with django_assert_num_queries(DETAIL_PAGE_QUERIES):
+        response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    assert len(response.context['comments']) == 3
+
+
+def test_post_detail_hides_unpublished_post_from_others(
+        client, user_client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    assert client.get(f'/posts/{post.id}/').status_code == 404, (
+        'Убедитесь, что снятая с публикации публикация недоступна'
+        ' другим пользователям.'
+    )
+    assert user_client.get(f'/posts/{post.id}/').status_code == 200, (
+        'Убедитесь, что автор видит свою снятую с публикации публикацию.'
+    )
+
+
+def test_save_does_not_load_deferred_text(
+        django_assert_num_queries, post_with_published_location):
+    post = type(post_with_published_location).objects.only(
+        'image', 'renditions').get(pk=post_with_published_location.pk)
+    with django_assert_num_queries(1):
+        post.save(update_fields=('renditions',))
+
+    post.text = 'Новый текст публикации'
+    post.save(update_fields=('text',))
+    post.refresh_from_db()
+    assert post.excerpt == 'Новый текст публикации'
@@ -0,0 +1,69 @@
+import re
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from core.worker import run_pending
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('media_root')]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def post_with_image(
+        post_with_published_location, django_capture_on_commit_callbacks):
+    def make(image):
+        post = post_with_published_location
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image = image
+            post.save()
+        run_pending()
+        post.refresh_from_db()
+        return post
+    return make
+
+
+def test_renditions_are_created(post_with_image, image_upload):
+    post = post_with_image(image_upload((2000, 1000)))
+    storage = post.image.storage
+    for rendition, width in (('card', 640), ('detail', 960), ('retina', 1280)):
+        files = post.renditions[rendition]
+        assert files['width'] == width
+        for image_format in ('webp', 'jpeg'):
+            assert storage.exists(files[image_format])
+    with Image.open(storage.path(post.renditions['card']['webp'])) as image:
+        assert image.size == (640, 320)
+
+
+@pytest.mark.parametrize('url', ['/', '/posts/{pk}/'])
+def test_pages_render_picture_with_srcset(
+        client, post_with_image, image_upload, url):
+    post = post_with_image(image_upload((2000, 1000)))
+    content = client.get(url.format(pk=post.pk)).content.decode('utf-8')
+    assert '<picture>' in content
+    storage = post.image.storage
+    assert re.search(
+        r'<source type="image/webp" srcset="[^"]*'
+        + re.escape(storage.url(post.renditions['retina']['webp']))
+        + r' 1280w', content)
+    assert 'srcset="' + storage.url(post.renditions['card']['jpeg']) in content
+    # Оригинал открывается по ссылке, но страница его не загружает.
+    assert content.count(post.image.url) == 1
+    assert f'href="{post.image.url}"' in content
+
+
+def test_broken_image_falls_back_to_original(client, post_with_image):
+    post = post_with_image(
+        SimpleUploadedFile('image.png', b'not an image', 'image/png'))
+    assert post.renditions == {'source': post.image.name}
+    content = client.get(f'/posts/{post.pk}/').content.decode('utf-8')
+    assert f'src="{post.image.url}"' in content
+    assert 'srcset' not in content
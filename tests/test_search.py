@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import index
+from blog.search.query import parse_query, snippet
+from blog.search.stemmer import stem
+from core.worker import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text='', **kwargs):
+        kwargs.setdefault('is_published', True)
+        kwargs.setdefault('pub_date', timezone.now() - timedelta(days=1))
+        return mixer.blend(
+            'blog.Post', title=title, text=text, author=user,
+            category=published_category, location=None, **kwargs)
+    return make
+
+
+def search_titles(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+    return [post.title for post in response.context['page_obj']]
+
+
+def test_parse_query():
+    assert parse_query('кот "рыжий пёс" OR мышь') == [
+        [('кот',), ('рыжий', 'пес')], [('мышь',)]]
+    assert parse_query('  ') == []
+
+
+def test_search_ranks_title_matches_first(client, make_post):
+    make_post('Заметки', 'В тексте упоминается путешествие.')
+    make_post('Путешествие в горы', 'Маршрут и снаряжение.')
+    make_post('Рецепт пирога', 'Мука и яблоки.')
+    assert search_titles(client, 'путешествие') == [
+        'Путешествие в горы', 'Заметки']
+
+
+def test_search_respects_visibility(client, make_post):
+    make_post('Видимый дракон')
+    make_post('Скрытый дракон', is_published=False)
+    make_post(
+        'Будущий дракон', pub_date=timezone.now() + timedelta(days=1))
+    assert search_titles(client, 'дракон') == ['Видимый дракон']
+
+
+def test_search_index_follows_changes(client, make_post):
+    post = make_post('Старое название')
+    post.title = 'Новое название'
+    post.save()
+    assert search_titles(client, 'старое') == []
+    assert search_titles(client, 'новое') == ['Новое название']
+    post.delete()
+    assert search_titles(client, 'новое') == []
+
+
+def test_snippet_escapes_html():
+    groups = parse_query('кот')
+    result = snippet('<script>alert(1)</script> Кот спит', groups)
+    assert '<script>' not in result
+    assert '<mark>Кот</mark>' in result
+
+
+@pytest.fixture
+def search_index(settings, tmp_path, media_root):
+    # Задачи из очереди обрабатывают и изображения публикаций.
+    settings.SEARCH_BACKEND = 'index'
+    settings.SEARCH_INDEX_DIR = tmp_path / 'index'
+    return settings
+
+
+def test_stem():
+    assert stem('путешествия') == stem('путешествие') == 'путешеств'
+    assert stem('книгами') == 'книг'
+    assert stem('Python') == 'python'
+
+
+def test_index_search(client, make_post, search_index):
+    make_post('Заметки', 'Горные путешествия зимой.')
+    make_post('Путешествие в горы', 'Маршрут и снаряжение.')
+    make_post('Горы', 'Путешествие по горам на поезде.')
+    make_post('Скрытое путешествие', is_published=False)
+    index.rebuild(chunk_size=2)
+    titles = search_titles(client, 'путешествиями')
+    assert titles[0] == 'Путешествие в горы'
+    assert sorted(titles[1:]) == ['Горы', 'Заметки']
+    assert search_titles(client, '"путешествие в горы"') == [
+        'Путешествие в горы']
+    assert search_titles(client, 'поезд ИЛИ снаряжение') == [
+        'Горы', 'Путешествие в горы']
+    assert search_titles(client, 'путешествие поезд') == ['Горы']
+    # Для частых слов ранжируются только сохранённые лучшие документы,
+    # и результат совпадает с полным обходом.
+    groups = parse_query('путешествиями')
+    best = index.get_index().search(groups, 2)
+    search_index.SEARCH_INDEX_MAX_RESULTS = 2
+    index.rebuild()
+    assert index.get_index().search(groups, 2) == best
+    assert index.get_index().segment.top(stem('путешествие')) is not None
+
+
+def test_index_updates_incrementally(
+        client, make_post, search_index, django_capture_on_commit_callbacks):
+    post = make_post('Старое название')
+    index.rebuild()
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = 'Новое название'
+        post.save()
+        make_post('Другое новое')
+    run_pending()
+    assert search_titles(client, 'старое') == []
+    assert search_titles(client, 'новое') == [
+        'Новое название', 'Другое новое']
+    search_index.SEARCH_INDEX_LOG_MAX_SIZE = 0
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    run_pending()
+    assert search_titles(client, 'новое') == ['Другое новое']
+    assert index.get_index().overlay.documents == {}
@@ -0,0 +1,45 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Настройки только для SQLite'),
+]
+
+
+def test_sqlite_pragmas_are_applied(settings):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA busy_timeout')
+        assert cursor.fetchone()[0] == settings.SQLITE_PRAGMAS['busy_timeout']
+        cursor.execute('PRAGMA synchronous')
+        assert cursor.fetchone()[0] == 1, 'Ожидается synchronous=NORMAL.'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_transactions_begin_immediate():
+    statements = []
+
+    def record(execute, sql, *args):
+        statements.append(sql)
+        return execute(sql, *args)
+
+    # Без блокировки процесса транзакция тоже должна сразу брать
+    # блокировку записи, чтобы писатели ждали busy_timeout.
+    with connection.execute_wrapper(record), transaction.atomic():
+        User.objects.count()
+    assert 'BEGIN IMMEDIATE' in statements
+
+
+def test_write_lock_serializes_comment(
+        settings, user_client, post_with_published_location):
+    from core.db import SQLiteWriteLockMiddleware
+
+    settings.SQLITE_WRITE_LOCK = True
+    post = post_with_published_location
+    response = user_client.post(
+        f'/posts/{post.pk}/comment/', {'text': 'Комментарий'})
+    assert response.status_code == 302
+    assert post.comments.count() == 1
+    assert not SQLiteWriteLockMiddleware.lock.locked()
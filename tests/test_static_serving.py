@@ -0,0 +1,48 @@
+import gzip
+
+import pytest
+
+
+@pytest.fixture
+def static_root(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    (tmp_path / 'css').mkdir()
+    content = b'body { color: black; }\n' * 100
+    (tmp_path / 'css' / 'site.0123456789ab.css').write_bytes(content)
+    (tmp_path / 'css' / 'site.0123456789ab.css.gz').write_bytes(
+        gzip.compress(content))
+    return content
+
+
+def test_static_file_is_served_compressed_and_immutable(client, static_root):
+    url = '/static/css/site.0123456789ab.css'
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/css'
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response['Cache-Control']
+    assert gzip.decompress(b''.join(response.streaming_content)) == (
+        static_root)
+
+    response = client.get(
+        url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304
+
+
+def test_static_file_range(client, static_root):
+    url = '/static/css/site.0123456789ab.css'
+    response = client.get(url, HTTP_RANGE='bytes=5-9')
+    assert response.status_code == 206
+    assert response['Content-Range'] == f'bytes 5-9/{len(static_root)}'
+    assert b''.join(response.streaming_content) == static_root[5:10]
+
+    response = client.get(url, HTTP_RANGE=f'bytes={len(static_root)}-')
+    assert response.status_code == 416
+
+
+def test_media_file_is_served(client, media_root):
+    (media_root / 'file.txt').write_bytes(b'media')
+    response = client.get('/media/file.txt')
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == b'media'
+    assert client.get('/media/../file.txt').status_code == 404
@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from core.worker import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+def stored_files(root):
+    return sorted(
+        path.relative_to(root).as_posix()
+        for path in root.rglob('*') if path.is_file())
+
+
+def test_same_image_is_stored_once(
+        media_root, image_upload, mixer, user,
+        django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        first, second = (
+            mixer.blend('blog.Post', author=user, image=image_upload())
+            for _ in range(2))
+    assert first.image.name == second.image.name
+    assert first.image.name.startswith('post_images/')
+    run_pending()
+    originals = [
+        name for name in stored_files(media_root)
+        if '/renditions/' not in name]
+    assert originals == [first.image.name], (
+        'Убедитесь, что одинаковые изображения хранятся одним файлом.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    run_pending()
+    assert (media_root / second.image.name).exists(), (
+        'Убедитесь, что файл не удаляется, пока на него ссылается '
+        'другая публикация.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Post.objects.get(pk=second.pk).delete()
+    run_pending()
+    assert stored_files(media_root) == []
+
+
+@pytest.mark.parametrize('stale', [False, True])
+def test_build_renditions_keeps_shared_files(
+        media_root, image_upload, mixer, user,
+        django_capture_on_commit_callbacks, stale):
+    with django_capture_on_commit_callbacks(execute=True):
+        first, second = (
+            mixer.blend('blog.Post', author=user, image=image_upload())
+            for _ in range(2))
+    run_pending()
+    second.refresh_from_db()
+    files = stored_files(media_root)
+    if stale:
+        # Копии построены для прежнего оригинала, но ссылаются на файлы,
+        # которыми пользуется и вторая публикация.
+        Post.objects.filter(pk=first.pk).update(renditions={
+            **second.renditions, 'source': 'post_images/old.png'})
+        call_command('build_renditions')
+    else:
+        call_command('build_renditions', '--force')
+    assert stored_files(media_root) == files, (
+        'Убедитесь, что команда не удаляет копии, которыми пользуются'
+        ' другие публикации.'
+    )
+    first.refresh_from_db()
+    assert first.renditions == second.renditions
+
+
+def test_failed_forced_rebuild_keeps_renditions(
+        media_root, image_upload, mixer, user,
+        django_capture_on_commit_callbacks,
+        monkeypatch):
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.cycle(2).blend('blog.Post', author=user, image=image_upload())
+    run_pending()
+    files = stored_files(media_root)
+
+    def fail(*args):
+        raise OSError('Нет места на диске')
+
+    monkeypatch.setattr('blog.images._encode', fail)
+    with pytest.raises(OSError):
+        call_command('build_renditions', '--force')
+    assert stored_files(media_root) == files, (
+        'Убедитесь, что копии не удаляются до того, как построены новые.'
+    )
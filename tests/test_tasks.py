@@ -0,0 +1,70 @@
+import pytest
+from django.core.management import call_command
+from PIL import Image
+
+from core.models import Task
+from core.worker import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def jpeg_with_exif(image_upload):
+    def make():
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: повернуть на 90°
+        exif[0x010F] = 'Camera'
+        return image_upload((800, 400), 'JPEG', exif)
+    return make
+
+
+def test_image_is_processed_by_worker(
+        media_root, jpeg_with_exif, post_with_published_location,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = jpeg_with_exif()
+        post.save()
+    post.refresh_from_db()
+    assert not post.renditions, (
+        'Убедитесь, что изображение обрабатывается не во время запроса.'
+    )
+    assert Task.objects.filter(
+        name='blog.process_post_image', status=Task.Status.PENDING
+    ).exists()
+
+    assert run_pending() == 1
+    post.refresh_from_db()
+    assert post.renditions['source'] == post.image.name
+    assert post.renditions['card']['width'] == 400
+    with Image.open(post.image.path) as original:
+        assert not original.getexif(), 'Убедитесь, что EXIF удалён.'
+        assert original.size == (400, 800)
+    assert Task.objects.get().status == Task.Status.DONE
+
+
+def test_build_renditions_strips_exif(
+        media_root, jpeg_with_exif, post_with_published_location):
+    # Изображение загружено до появления очереди: задачи для него нет.
+    post = post_with_published_location
+    post.image = jpeg_with_exif()
+    post.save()
+    call_command('build_renditions')
+    post.refresh_from_db()
+    assert post.renditions['source'] == post.image.name
+    with Image.open(post.image.path) as original:
+        assert not original.getexif()
+
+
+def test_failed_task_is_retried(settings, django_capture_on_commit_callbacks):
+    from core.queue import enqueue
+
+    settings.TASKS_MAX_ATTEMPTS = 2
+    settings.TASKS_RETRY_DELAY = 0
+    with django_capture_on_commit_callbacks(execute=True):
+        enqueue('blog.process_post_image', 'not-a-pk')
+    run_pending()
+    task = Task.objects.get()
+    assert task.status == Task.Status.FAILED
+    assert task.attempts == 2
+    assert 'Traceback' in task.last_error
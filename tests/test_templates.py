@@ -0,0 +1,6 @@
+from core.templates import warm_templates
+
+
+def test_all_templates_compile():
+    loaded, errors = warm_templates()
+    assert loaded and not errors, errors
@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_data(published_category):
+    return {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': '2020-01-01 10:00',
+        'category': published_category.pk,
+    }
+
+
+def test_oversized_upload_is_rejected(
+        settings, media_root, user_client, post_data):
+    settings.POST_IMAGE_MAX_SIZE = 1024
+    post_data['image'] = SimpleUploadedFile(
+        'image.png', b'x' * 200 * 1024, 'image/png')
+    response = user_client.post('/posts/create/', data=post_data)
+    assert response.status_code == 200
+    assert 'image' in response.context['form'].errors, (
+        'Убедитесь, что слишком большой файл отклоняется с ошибкой.'
+    )
+    assert not Post.objects.exists()
+    assert not any(media_root.iterdir())
+
+
+def test_image_dimensions_are_limited(
+        settings, media_root, image_upload, user_client, post_data):
+    settings.POST_IMAGE_MAX_PIXELS = 100 * 100
+    post_data['image'] = image_upload((200, 200))
+    response = user_client.post('/posts/create/', data=post_data)
+    assert 'image' in response.context['form'].errors
+    assert not Post.objects.exists()
+
+
+def test_upload_progress_is_reported(
+        media_root, image_upload, user_client, post_data):
+    post_data['image'] = image_upload((20, 20))
+    response = user_client.post(
+        '/posts/create/?X-Progress-ID=abc', data=post_data)
+    assert response.status_code == 302
+    progress = user_client.get(
+        '/posts/upload-progress/?X-Progress-ID=abc').json()
+    assert progress['done'] and progress['received'] == progress['size']
+    cache.clear()
+
+
+def test_post_form_still_checks_csrf(user, post_data):
+    from django.test import Client
+
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.post('/posts/create/', data=post_data)
+    assert response.status_code == 403